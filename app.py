@@ -1,14 +1,31 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
-import requests
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, Response, stream_with_context, g
 from tools.ysws_catalog import generate_yml
-from tools.commits import get_commit_count
-from tools.aicheck import get_readme_from_github, detect_ai_probability
+from tools.commits import get_commit_count, get_commit_stats
+from tools.github import GitHubError
+from tools.aicheck import get_readme_from_github, detect_ai_probability, parse_ai_probability, use_result_cache
 from datetime import datetime
 import os
 import secrets
+import queue
+import time
 import json
-from tools.chatbot import ask_hackclub_ai
-import psutil
+import requests
+from tools.chatbot import ask_hackclub_ai, stream_hackclub_ai, answer_cache
+from tools.hackatime import get_user_stats, HackatimeError, stats_cache, resolve_hours, STATS_FEATURES
+from tools.batch import parse_rows, review_rows, MAX_ROWS
+from tools.project_summary import build_project_summary
+from tools.repo_analysis import analyze_repo, clone_path, GitError
+from tools.github import parse_repo_url
+from utils.logstore import LogStore
+from utils.credstore import RecordStore
+from utils.sqlstore import Database, SqliteRecordStore, SqliteLogStore
+from utils.diskcache import DiskCache
+from utils.monitor import Monitor, take_sample
+from utils.timeseries import TimeSeriesStore, HistoryRecorder
+from utils.metrics import registry as metrics
+from utils.sessions import SessionStore, ServerSessionInterface
+from utils.assets import Assets
+from utils.images import ImageVariants
 import sys
 
 app = Flask(__name__)
@@ -16,93 +33,166 @@ app.secret_key = '6294d6140ad5b58e8352a1e620d2d845'
 
 # File paths
 
-if "--dev" in sys.argv:
+# "--dev" works for `python app.py --dev`, YSWS_DEV=1 for gunicorn and serve.py
+DEV = "--dev" in sys.argv or os.environ.get('YSWS_DEV') == '1'
 
-    
+if DEV:
     KEYS_FILE = 'admin_keys.json'
     USERS_FILE = 'users.json'
     LOGS_FILE = 'activity_logs.json'
+    DB_FILE = 'panel.db'
+    AI_CACHE_FILE = 'readme_ai_cache.db'
+    METRICS_FILE = 'metrics.bin'
+    WORKER_METRICS_DIR = 'worker_metrics'
+    SESSIONS_FILE = 'sessions.db'
+    REPO_CACHE_DIR = 'repo_cache'
+    IMAGE_CACHE_DIR = 'image_cache'
 else:
     KEYS_FILE = '/home/jim/admin_keys.json'
     USERS_FILE = '/home/jim/users.json'
     LOGS_FILE = '/home/jim/activity_logs.json'
+    DB_FILE = '/home/jim/panel.db'
+    AI_CACHE_FILE = '/home/jim/readme_ai_cache.db'
+    METRICS_FILE = '/home/jim/metrics.bin'
+    WORKER_METRICS_DIR = '/home/jim/worker_metrics'
+    SESSIONS_FILE = '/home/jim/sessions.db'
+    REPO_CACHE_DIR = '/home/jim/repo_cache'
+    IMAGE_CACHE_DIR = '/home/jim/image_cache'
+
+# keys, users and logs live in SQLite, the JSON files are imported into it
+# once on first start. STORAGE_BACKEND=json keeps using the files directly.
+if os.environ.get('STORAGE_BACKEND', 'sqlite') == 'json':
+    log_store = LogStore(LOGS_FILE)
+    key_store = RecordStore(KEYS_FILE, 'key')
+    user_store = RecordStore(USERS_FILE, 'username')
+else:
+    database = Database(DB_FILE)
+    log_store = SqliteLogStore(database, legacy_path=LOGS_FILE)
+    key_store = SqliteRecordStore(database, 'admin_keys', 'key', legacy_path=KEYS_FILE)
+    user_store = SqliteRecordStore(database, 'users', 'username', legacy_path=USERS_FILE)
+readme_ai_cache = DiskCache(AI_CACHE_FILE)
+use_result_cache(readme_ai_cache)
+
+# the session cookie only holds an id, session data stays on the server
+session_store = SessionStore(Database(SESSIONS_FILE))
+app.session_interface = ServerSessionInterface(session_store)
+
+# fingerprinted static files, built by create_app() outside of --dev
+assets = Assets(app.static_folder)
+app.add_url_rule('/assets/<path:filename>', 'dist_asset', assets.serve)
+app.jinja_env.globals.update(asset_url=assets.url, font_links=assets.font_links, icon_links=assets.icon_links)
+
+# resized AVIF/WebP copies of static images for {{ responsive_img(...) }}
+images = ImageVariants(app.static_folder, IMAGE_CACHE_DIR, assets.url)
+app.add_url_rule('/img/<int:width>/<fmt>/<path:filename>', 'image_variant', images.serve)
+app.jinja_env.globals.update(responsive_img=images.picture)
+
+def _new_logs(after):
+    # called by the monitor thread, once per tick for all open admin pages
+    if after is None:
+        return log_store.query(limit=1)
+    logs = log_store.query(after=after, limit=200)
+    superadmins = {u['username'] for u in user_store.all() if u.get('superadmin', False)}
+    for log in logs:
+        log['is_superadmin'] = log.get('username') in superadmins
+    return logs
+
+HISTORY_FIELDS = ('ram_used_mb', 'ram_total_mb', 'cpu_percent', 'temp_c', 'load1', 'load5', 'load15')
+
+def _history_sample():
+    sample = take_sample()
+    load1, load5, load15 = sample['load'] or (None, None, None)
+    return dict(sample, load1=load1, load5=load5, load15=load15)
+
+stats_history = TimeSeriesStore(METRICS_FILE, HISTORY_FIELDS)
+history_recorder = HistoryRecorder(stats_history, _history_sample)
+
+def _latest_sample():
+    # the history recorder already samples once a second in one worker, every
+    # worker's monitor just reads its newest point from the shared file
+    point = stats_history.latest()
+    if point is None:
+        # the recorder hasn't written anything yet
+        return take_sample()
+    return {
+        'time': point['time'],
+        'ram_used_mb': round(point['ram_used_mb']),
+        'ram_total_mb': round(point['ram_total_mb']),
+        'cpu_percent': point['cpu_percent'],
+        'temp_c': point['temp_c'],
+        'load': [point['load1'], point['load5'], point['load15']] if point['load1'] is not None else None,
+    }
 
-def get_ram_usage():
-    ram = psutil.virtual_memory()
-    used = ram.used / (1024 ** 2)     
-    total = ram.total / (1024 ** 2)    
-    return f"{used:.0f} MB / {total:.0f} MB"
-
-def get_cpu_temp():
-    try:
-        with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
-            temp = int(f.read()) / 1000  
-        return f"{temp:.1f}°C"
-    except FileNotFoundError:
-        return "N/A"
+monitor = Monitor(sample=_latest_sample, fetch_logs=_new_logs)
+
+metrics.configure(WORKER_METRICS_DIR)
+
+# optional bearer token for a Prometheus scraper, which can't log in
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+@app.before_request
+def start_history_recorder():
+    # started from a request so it runs in the worker, never in a preloading master
+    history_recorder.ensure_started()
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    # streamed responses (chat, batch review, events) are timed to their headers
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('route', f"{request.method} {route}", time.perf_counter() - started,
+                        error=response.status_code >= 500,
+                        bytes_in=request.content_length or 0,
+                        bytes_out=response.content_length or 0)
+    return response
+
+def format_stats(sample):
+    temp = sample['temp_c']
+    load = sample['load']
+    return {
+        "ram": f"{sample['ram_used_mb']} MB / {sample['ram_total_mb']} MB",
+        "temp": f"{temp:.1f}°C" if temp is not None else "N/A",
+        "cpu": f"{sample['cpu_percent']:.0f}%",
+        "load": " ".join(f"{value:.2f}" for value in load) if load is not None else "N/A",
+    }
 
 @app.route("/stats")
 def stats():
-    return jsonify({
-        "ram": get_ram_usage(),
-        "temp": get_cpu_temp()
-    })
+    return jsonify(format_stats(monitor.latest()))
 
 def log_activity(username, action, details=None):
-    logs = load_json_file(LOGS_FILE)
     log_entry = {
         'timestamp': str(datetime.now()),
         'username': username,
         'action': action,
         'details': details
     }
-    logs.append(log_entry)
+    log_store.append(log_entry)
 
-    if len(logs) > 200:
-        logs = logs[-200:]
-
-    save_json_file(LOGS_FILE, logs)
-
-
-def load_json_file(filename):
-    try:
-        with open(filename, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-
-
-def save_json_file(filename, data):
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
 
 def load_admin_keys():
-    return load_json_file(KEYS_FILE)
+    return key_store.all()
 
 def load_users():
-    return load_json_file(USERS_FILE)
+    return user_store.all()
 
 def load_logs():
-    return load_json_file(LOGS_FILE)
+    return log_store.tail()
 
 def save_admin_keys(keys):
-    save_json_file(KEYS_FILE, keys)
+    key_store.replace(keys)
 
 def save_users(users):
-    save_json_file(USERS_FILE, users)
+    user_store.replace(users)
 
 def generate_key():
     return secrets.token_hex(16)
 
 def is_superadmin(username):
-    users = load_users()
-    print(f"Debug: Checking superadmin for username: {username}")
-    print(f"Debug: Loaded users: {users}")
-    user = next((u for u in users if u['username'] == username), None)
-    print(f"Debug: Found user: {user}")
-    result = user and user.get('superadmin', False)
-    print(f"Debug: Is superadmin: {result}")
-    return result
+    user = user_store.get(username)
+    return user and user.get('superadmin', False)
 
 def login_required(f):
     def decorated_function(*args, **kwargs):
@@ -129,16 +219,12 @@ def login():
         admin_key = request.form.get('admin_key', '').strip()
         
         if admin_key:
-            keys = load_admin_keys()
-            print(f"Debug: Admin key entered: {admin_key}")
-            print(f"Debug: Available keys: {keys}")
-            key_data = next((k for k in keys if k['key'] == admin_key), None)
-            print(f"Debug: Found key data: {key_data}")
+            key_data = key_store.get(admin_key)
             
             if key_data:
+                session.regenerate()
                 session['username'] = key_data['name']
                 session['admin_key'] = admin_key
-                print(f"Debug: Session username set to: {session['username']}")
                 log_activity(key_data['name'], 'logged in')
                 return redirect(url_for('main'))
             else:
@@ -169,7 +255,6 @@ def ysws_catalog():
 
         if all([name, description, website, slack, slack_channel, status, deadline]):
             yml_code = generate_yml(name, description, website, slack, slack_channel, status, dt.isoformat())
-            print(yml_code)
             log_activity(session['username'], 'generated ysws catalog entry', f'name: {name}')
             return render_template('ysws_catalog.html', 
                                 username=session['username'],
@@ -186,11 +271,14 @@ def ysws_catalog():
 @app.route("/github-commits", methods=['GET', 'POST'])
 @login_required
 def github_commits():
-    commit_count = None
+    commit_stats = None
     if request.method == 'POST':
         github_url = request.form.get('github_url')
         if github_url:
-            commit_count = get_commit_count(github_url)
+            try:
+                commit_stats = get_commit_stats(github_url, details=request.form.get('details') == 'on')
+            except (GitHubError, ValueError) as e:
+                commit_stats = {'error': str(e)}
             log_activity(session['username'], 'searched github commits', f'url: {github_url}')
     
     if request.method == 'GET':
@@ -198,8 +286,8 @@ def github_commits():
     
     return render_template('github_commits.html', 
                           username=session['username'],
-                          commit_count=commit_count,
-                          show_result=commit_count is not None)
+                          commit_stats=commit_stats,
+                          show_result=commit_stats is not None)
 
 @app.route("/readme-ai-check", methods=['GET', 'POST'])
 @login_required
@@ -213,21 +301,7 @@ def readme_ai_check():
                 
                 if readme_content:
                     ai_probability = detect_ai_probability(readme_content)
-                    
-                    try:
-                        if '<think>' in ai_probability and '</think>' in ai_probability:
-                            parts = ai_probability.split('</think>')
-                            if len(parts) > 1:
-                                probability_str = parts[1].strip()
-                                probability_float = float(probability_str)
-                            else:
-                                probability_float = 0.0
-                        else:
-                            probability_float = float(ai_probability)
-                        
-                        percentage = int(probability_float * 100)
-                    except:
-                        percentage = 0
+                    percentage = parse_ai_probability(ai_probability)
                     
                     ai_result = {
                         'score': percentage,
@@ -262,48 +336,39 @@ def commits_hours_ratio():
         
         if all([slack_id, project_name, github_url]):
             try:
-                url = f"https://hackatime.hackclub.com/api/v1/users/{slack_id}/stats?features=projects"
-                response = requests.get(url)
+                hackatime_data = get_user_stats(slack_id, features=STATS_FEATURES)
                 
-                if response.status_code == 200:
-                    hackatime_data = response.json()
-                    print(f"HackaTime API response: {hackatime_data}")
-                    
-                    projects_array = hackatime_data.get('data', {}).get('projects', [])
-                    print(f"Projects array: {projects_array}")
+                projects_array = hackatime_data.get('data', {}).get('projects', [])
+                
+                project_found = None
+                for project in projects_array:
+                    if project.get('name') == project_name:
+                        project_found = project
+                        break
+                
+                if project_found:
+                    hours = project_found.get('total_seconds', 0) / 3600
                     
-                    project_found = None
-                    for project in projects_array:
-                        if project.get('name') == project_name:
-                            project_found = project
-                            break
+                    commit_count = get_commit_count(github_url)
                     
-                    if project_found:
-                        print(f"Project found: {project_found}")
-                        hours = project_found.get('total_seconds', 0) / 3600
-                        
-                        commit_count = get_commit_count(github_url)
-                        print(f"Commit count: {commit_count}")
-                        
-                        if isinstance(commit_count, int) and hours > 0:
-                            ratio = commit_count / hours
-                            ratio_data = {
-                                'commits': commit_count,
-                                'hours': round(hours, 2),
-                                'ratio': round(ratio, 2)
-                            }
-                            log_activity(session['username'], 'checked commits hours ratio', f'slack_id: {slack_id}, project: {project_name}, ratio: {ratio}')
-                        else:
-                            ratio_data = {'error': f'Invalid commit count ({commit_count}) or zero hours ({hours})'}
+                    if hours > 0:
+                        ratio = commit_count / hours
+                        ratio_data = {
+                            'commits': commit_count,
+                            'hours': round(hours, 2),
+                            'ratio': round(ratio, 2)
+                        }
+                        log_activity(session['username'], 'checked commits hours ratio', f'slack_id: {slack_id}, project: {project_name}, ratio: {ratio}')
                     else:
-                        available_projects = [p.get('name') for p in projects_array]
-                        ratio_data = {'error': f'Project "{project_name}" not found. Available projects: {available_projects}'}
+                        ratio_data = {'error': f'No hours logged on "{project_name}"'}
                 else:
-                    ratio_data = {'error': f'HackaTime API error: {response.status_code} - {response.text}'}
+                    available_projects = [p.get('name') for p in projects_array]
+                    ratio_data = {'error': f'Project "{project_name}" not found. Available projects: {available_projects}'}
                     
+            except HackatimeError as e:
+                ratio_data = {'error': f'HackaTime API error: {e.status_code} - {e.text}'}
             except Exception as e:
                 ratio_data = {'error': f'Error: {str(e)}'}
-                print(f"Exception in commits_hours_ratio: {e}")
         else:
             ratio_data = {'error': 'Please fill in all fields'}
     
@@ -315,6 +380,79 @@ def commits_hours_ratio():
                           ratio_data=ratio_data,
                           show_result=ratio_data is not None)
 
+@app.route("/repo-analysis", methods=['GET', 'POST'])
+@login_required
+def repo_analysis():
+    analysis = None
+    if request.method == 'POST':
+        github_url = request.form.get('github_url', '')
+        slack_id = request.form.get('slack_id', '').strip()
+        project_name = request.form.get('project_name', '').strip()
+        try:
+            owner, repo = parse_repo_url(github_url)
+            analysis = dict(analyze_repo(
+                f"https://github.com/{owner}/{repo}.git",
+                clone_path(REPO_CACHE_DIR, owner, repo),
+            ))
+            analysis['repo'] = f"{owner}/{repo}"
+
+            if slack_id and project_name:
+                projects = get_user_stats(slack_id, features=STATS_FEATURES).get('data', {}).get('projects', [])
+                project = next((p for p in projects if p.get('name') == project_name), None)
+                if project is None:
+                    analysis['hours_error'] = f'Project "{project_name}" not found on HackaTime'
+                elif project.get('total_seconds', 0) > 0:
+                    hours = project['total_seconds'] / 3600
+                    lines = analysis['lines_added'] + analysis['lines_deleted']
+                    analysis['hours'] = round(hours, 2)
+                    analysis['commits_per_hour'] = round(analysis['total_commits'] / hours, 2)
+                    analysis['lines_per_hour'] = round(lines / hours, 1)
+        except ValueError as e:
+            analysis = {'error': str(e)}
+        except GitError as e:
+            analysis = {'error': f'Could not clone or fetch the repository: {e}'}
+        except HackatimeError as e:
+            analysis = {'error': f'HackaTime API error: {e.status_code} - {e.text}'}
+        log_activity(session['username'], 'ran repo analysis', f'url: {github_url}')
+
+    if request.method == 'GET':
+        log_activity(session['username'], 'accessed repo analysis')
+
+    return render_template('repo_analysis.html',
+                          username=session['username'],
+                          analysis=analysis,
+                          show_result=analysis is not None)
+
+@app.route("/batch-review")
+@login_required
+def batch_review():
+    log_activity(session['username'], 'accessed batch review')
+    return render_template('batch_review.html', username=session['username'])
+
+@app.route("/batch-review/run", methods=['POST'])
+@login_required
+def batch_review_run():
+    text = request.form.get('rows', '')
+    upload = request.files.get('csv_file')
+    if upload and upload.filename:
+        text = upload.read().decode('utf-8-sig', errors='replace')
+
+    rows, dropped = parse_rows(text)
+    if not rows:
+        return jsonify({'error': 'No rows found'}), 400
+
+    check_readme = request.form.get('check_readme') == 'on'
+    log_activity(session['username'], 'ran batch review', f'rows: {len(rows)}, dropped: {dropped}, readme ai: {check_readme}')
+
+    def generate():
+        yield json.dumps({'total': len(rows), 'dropped': dropped, 'max_rows': MAX_ROWS, 'rows': rows}) + '\n'
+        for result in review_rows(rows, check_readme=check_readme):
+            yield json.dumps(result) + '\n'
+
+    # one JSON object per line, flushed as each row finishes
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'})
+
 @app.route("/hour_finder", methods=['GET', 'POST'])
 @login_required
 def find_hackatime():
@@ -329,18 +467,13 @@ def find_hackatime():
                                    username=session['username'],
                                    error="Please fill in the user ID")
 
-        url = f"https://hackatime.hackclub.com/api/v1/users/{user_id}/stats?features=projects"
-        if projectname:
-            url += f"&filter_by_project={projectname}"
-
-        response = requests.get(url)
-        if response.status_code == 200:
-            hackatime_data = response.json()
+        try:
+            hackatime_data = get_user_stats(user_id, features=STATS_FEATURES, project=projectname or None)
             trust_value_int = hackatime_data.get('trust_factor', {}).get('trust_value', 0)
             trust_value = True if trust_value_int == 1 else False
             log_activity(session['username'], 'searched up user on hour finder', f'user_id: {user_id}, project: {projectname or "all"}')
-        else:
-            hackatime_data = {"error": f"HTTP {response.status_code}"}
+        except HackatimeError as e:
+            hackatime_data = {"error": f"HTTP {e.status_code}"}
 
     if request.method == 'GET':
         log_activity(session['username'], 'accessed hour finder')
@@ -364,23 +497,20 @@ def fraud_checker():
                                    username=session['username'],
                                    error="Please fill in the user ID")
 
-        url = f"https://hackatime.hackclub.com/api/v1/users/{user_id}/stats"
-
-        response = requests.get(url)
-        if response.status_code == 200:
-            hackatime_data = response.json()
+        try:
+            # the STATS_FEATURES payload is a superset of the plain stats,
+            # so this shares a cache entry with the other hackatime tools
+            hackatime_data = get_user_stats(user_id, features=STATS_FEATURES)
             trust_value_int = hackatime_data.get('trust_factor', {}).get('trust_value', 0)
             if trust_value_int == 1:
                 trust_value = True
             else:
                 trust_value = False
-            print(trust_value)
             if trust_value_int == None:
                 trust_value_int = "Failure To get"
             log_activity(session['username'], 'searched up user on fraud checker', f'user_id: {user_id}')
-        else:
-            hackatime_data = {"error": f"HTTP {response.status_code}"}
-    print(trust_value if trust_value is not None else "No trust value found")
+        except HackatimeError as e:
+            hackatime_data = {"error": f"HTTP {e.status_code}"}
     
     if request.method == 'GET':
         log_activity(session['username'], 'accessed fraud checker')
@@ -408,37 +538,108 @@ def admin():
         })
     
     user_list.sort(key=lambda x: (not x['is_superadmin'], x['username']))
+
+    cache_stats = {
+        'Hackatime stats': stats_cache.stats(),
+        'Chatbot answers': answer_cache.stats(),
+        'README AI results': readme_ai_cache.stats(),
+    }
     
-    return render_template('admin.html', username=session['username'], keys=keys, users=user_list, is_superadmin=is_super)
+    return render_template('admin.html', username=session['username'], keys=keys, users=user_list, is_superadmin=is_super, cache_stats=cache_stats)
+
+LOGS_PAGE_SIZE = 100
+
+def _log_filters():
+    # datetime-local inputs send "2025-01-01T10:00", stored timestamps use a space
+    def timestamp(name):
+        value = request.args.get(name, '').strip()
+        return value.replace('T', ' ') if value else None
+
+    return {
+        'username': request.args.get('user') or None,
+        'action': request.args.get('action') or None,
+        'start': timestamp('start'),
+        'end': timestamp('end'),
+    }
 
 @app.route("/admin/logs")
 @login_required
 def admin_logs():
-    logs = load_logs()
-    users = load_users()
     admin_keys = load_admin_keys()
-    
     log_activity(session['username'], 'accessed admin logs')
-    
-    all_users = []
-    
-    for key_data in admin_keys:
-        user_info = {
-            'username': key_data['name'],
-            'is_superadmin': False
-        }
-        
-        user = next((u for u in users if u['username'] == key_data['name']), None)
-        if user and user.get('superadmin', False):
-            user_info['is_superadmin'] = True
-        
-        all_users.append(user_info)
-    
+    usernames = sorted({key_data['name'] for key_data in admin_keys})
+    return render_template('admin_logs.html', username=session['username'], users=usernames)
+
+@app.route("/admin/logs/entries")
+@login_required
+def admin_logs_entries():
+    # ?before=<id> pages back through history, ?after=<id> returns only the
+    # entries newer than what the page already shows
+    before = request.args.get('before', type=int)
+    after = request.args.get('after', type=int)
+    limit = max(1, min(request.args.get('limit', LOGS_PAGE_SIZE, type=int), 500))
+    logs = log_store.query(before=before, after=after, limit=limit, **_log_filters())
+
+    superadmins = {u['username'] for u in load_users() if u.get('superadmin', False)}
     for log in logs:
-        user = next((u for u in all_users if u['username'] == log['username']), None)
-        log['is_superadmin'] = user.get('is_superadmin', False) if user else False
-    
-    return render_template('admin_logs.html', username=session['username'], logs=logs, users=all_users)
+        log['is_superadmin'] = log.get('username') in superadmins
+
+    older = logs[0]['id'] if logs and after is None and len(logs) == limit else None
+    return jsonify({'logs': logs, 'older_cursor': older})
+
+@app.route("/admin/events")
+@login_required
+def admin_events():
+    # one SSE stream per admin page: "stats" every sample, "log" for each new
+    # activity entry, and a comment every 15s so proxies keep it open
+    def generate():
+        q = monitor.subscribe()
+        try:
+            yield f"event: stats\ndata: {json.dumps(format_stats(monitor.latest()))}\n\n"
+            while True:
+                try:
+                    event, data = q.get(timeout=15)
+                except queue.Empty:
+                    yield ": ping\n\n"
+                    continue
+                if event == 'stats':
+                    data = format_stats(data)
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            monitor.unsubscribe(q)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'})
+
+@app.route("/stats/history")
+@login_required
+def stats_history_series():
+    # ?range=<seconds back from now> picks the finest resolution that covers it,
+    # ?step=1|60|900 forces one; each field comes as an average and a _max series
+    now = time.time()
+    seconds = max(1, min(request.args.get('range', 600, type=int), 30 * 24 * 3600))
+    step = request.args.get('step', type=int)
+    if step is not None and step not in [s for s, _ in stats_history.resolutions]:
+        return jsonify({'error': 'step must be one of 1, 60, 900'}), 400
+    return jsonify(stats_history.query(now - seconds, now, step))
+
+@app.route("/admin/metrics")
+@login_required
+def admin_metrics():
+    log_activity(session['username'], 'accessed request metrics')
+    rows = metrics.summary()
+    return render_template('admin_metrics.html', username=session['username'],
+                           routes=[r for r in rows if r['kind'] == 'route'],
+                           upstreams=[r for r in rows if r['kind'] == 'upstream'])
+
+@app.route("/metrics")
+def prometheus_metrics():
+    authorized = 'username' in session or (
+        METRICS_TOKEN and request.headers.get('Authorization') == f"Bearer {METRICS_TOKEN}"
+    )
+    if not authorized:
+        return Response("Unauthorized\n", status=401, mimetype='text/plain')
+    return Response(metrics.prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route("/admin/generate", methods=['POST'])
 @login_required
@@ -450,7 +651,6 @@ def generate_admin_key():
     name = request.form.get('name')
     if name:
         new_key = generate_key()
-        keys = load_admin_keys()
         
         key_data = {
             'name': name,
@@ -459,8 +659,7 @@ def generate_admin_key():
             'generated_at': str(datetime.now())
         }
         
-        keys.append(key_data)
-        save_admin_keys(keys)
+        key_store.add(key_data)
         
         log_activity(session['username'], 'generated admin key', f'for user: {name}')
         flash(f'New admin key generated for {name}: {new_key}', 'success')
@@ -476,14 +675,9 @@ def promote_to_superadmin():
     
     username = request.form.get('username')
     if username:
-        users = load_users()
-        for user in users:
-            if user['username'] == username:
-                user['superadmin'] = True
-                save_users(users)
-                log_activity(session['username'], 'promoted user to superadmin', f'user: {username}')
-                flash(f'{username} has been promoted to superadmin!', 'success')
-                break
+        if user_store.update(username, superadmin=True):
+            log_activity(session['username'], 'promoted user to superadmin', f'user: {username}')
+            flash(f'{username} has been promoted to superadmin!', 'success')
         else:
             flash(f'User {username} not found.', 'error')
     
@@ -498,9 +692,7 @@ def revoke_admin_key():
     
     key_to_revoke = request.form.get('key')
     if key_to_revoke:
-        keys = load_admin_keys()
-        keys = [k for k in keys if k['key'] != key_to_revoke]
-        save_admin_keys(keys)
+        key_store.remove(key_to_revoke)
         log_activity(session['username'], 'revoked admin key', f'key: {key_to_revoke[:8]}...')
         flash('Admin key revoked successfully', 'success')
     
@@ -523,7 +715,41 @@ def terminology():
 @login_required
 def automation_hackatime():
     log_activity(session['username'], 'accessed airtable automation hackatime')
-    return render_template('airtable_automation_hackatime_peleg.html', username=session['username'])
+    return render_template('airtable_automation_hackatime_peleg.html', username=session['username'],
+                           api_url=url_for('hackatime_hours_api', _external=True))
+
+RESOLVE_MAX_ITEMS = 1000
+
+# bearer token for scripts (the Airtable automation) that can't log in. It
+# only opens this route, so pasting it into a shared base doesn't hand out
+# an admin key. Unset, the route only works with a session.
+HACKATIME_API_TOKEN = os.environ.get('HACKATIME_API_TOKEN')
+
+@app.route("/api/hackatime/hours", methods=['POST'])
+def hackatime_hours_api():
+    username = session.get('username')
+    auth = request.headers.get('Authorization', '')
+    if (username is None and HACKATIME_API_TOKEN and auth.startswith('Bearer ')
+            and secrets.compare_digest(auth[len('Bearer '):].strip(), HACKATIME_API_TOKEN)):
+        username = 'hackatime api token'
+    if username is None:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    payload = request.get_json(silent=True) or {}
+    items = payload.get('items')
+    if not isinstance(items, list):
+        return jsonify({'error': 'Expected {"items": [{"slack_id": ..., "project": ...}, ...]}'}), 400
+    if len(items) > RESOLVE_MAX_ITEMS:
+        return jsonify({'error': f'At most {RESOLVE_MAX_ITEMS} items per request'}), 400
+
+    items = [
+        {'slack_id': str(item.get('slack_id') or '').strip(), 'project': str(item.get('project') or '').strip()}
+        if isinstance(item, dict) else {'slack_id': '', 'project': ''}
+        for item in items
+    ]
+    results = resolve_hours(items)
+    log_activity(username, 'resolved hackatime hours', f'items: {len(items)}')
+    return jsonify({'results': results})
 
 
 @app.route("/chatbot")
@@ -544,74 +770,46 @@ def chat():
 
     return ai_response
 
-@app.route("/project_summary", methods=['GET', 'POST'])
+@app.route("/chat/stream", methods=["POST"])
 @login_required
-def project_summary():
-    try:
-        if trust_value is None:
-            trust_value = None
-    except NameError:
-        trust_value = None
-    if 'project_summary' not in session:
-        session['project_summary'] = None
-    project_summary = session['project_summary']
-    if 'show_result' not in session:
-        session['show_result'] = 1
-    if request.method == 'POST':
-        if session['show_result'] == 1:
-            user_id = request.form.get('id')
-            # projectname = request.form.get('projectname')
-            projectname = None
-
-            if not user_id:
-                return render_template('project_summary.html', 
-                                    username=session['username'],
-                                    error="Please fill in the user ID")
-
-            url = f"https://hackatime.hackclub.com/api/v1/users/{user_id}/stats?features=projects"
-            if projectname:
-                url += f"&filter_by_project={projectname}"
-
-            response = requests.get(url)
-            if response.status_code == 200:
-                project_summary = response.json()
-                trust_value_int = project_summary.get('trust_factor', {}).get('trust_value', 0)
-                trust_value = True if trust_value_int == 1 else False
-                log_activity(session['username'], 'searched up user on hour finder', f'user_id: {user_id}, project: {projectname or "all"}')
-            else:
-                project_summary = {"error": f"HTTP {response.status_code}"}
-            session['show_result'] = 2
+def chat_stream():
+    user_input = request.json.get("message")
+    log_activity(session['username'], f'asked chatbot: {user_input}')
+    username = session['username']
 
-            session['project_summary'] = project_summary
-            return render_template('project_summary.html', 
-                           username=session['username'],
-                           summary=project_summary,
-                           trust_value=trust_value,
-                           show_result=session['show_result'])
+    def generate():
+        try:
+            for text in stream_hackclub_ai(username=username, question=user_input):
+                yield f"data: {json.dumps(text)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
 
-        elif session['show_result'] == 2:
-            projectname = request.form.get('projectname')
-            project_summary = project_summary
-            session['show_result'] = 3
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'})
 
-            session['project_summary'] = project_summary
-            return render_template('project_summary.html', 
-                username=session['username'],
-                summary=project_summary,
-                trust_value=trust_value,
-                show_result=session['show_result'])
+@app.route("/project_summary")
+@login_required
+def project_summary():
+    log_activity(session['username'], 'accessed project summary')
+    return render_template('project_summary.html', username=session['username'])
 
-        print(session['show_result'])
+@app.route("/api/project_summary")
+@login_required
+def project_summary_api():
+    user_id = request.args.get('id', '').strip()
+    if not user_id:
+        return jsonify({'error': 'Please fill in the user ID'}), 400
 
-    if request.method == 'GET':
-        log_activity(session['username'], 'accessed project summary')
+    try:
+        summary = build_project_summary(user_id)
+    except HackatimeError as e:
+        return jsonify({'error': f'HackaTime API error: HTTP {e.status_code}'}), 502
+    except requests.RequestException:
+        return jsonify({'error': 'Could not reach the HackaTime API'}), 502
 
-    print(session['show_result'])
-    return render_template('project_summary.html', 
-                           username=session['username'],
-                           summary=project_summary,
-                           trust_value=trust_value,
-                           show_result=session['show_result'])
+    log_activity(session['username'], 'searched up user on project summary', f'user_id: {user_id}')
+    return jsonify(summary)
 
 @app.route("/dns-github", methods=['GET', 'POST'])
 @login_required
@@ -695,8 +893,8 @@ def hcb():
     log_activity(session['username'], 'accessed hcb org creator')
     return render_template('hcb.html', username=session['username'])
 
-if __name__ == "__main__":
-    if not os.path.exists(KEYS_FILE):
+def init_data_files():
+    if not os.path.exists(KEYS_FILE) and not key_store.all():
         initial_keys = [
             {
                 'name': 'jim',
@@ -707,7 +905,7 @@ if __name__ == "__main__":
         ]
         save_admin_keys(initial_keys)
     
-    if not os.path.exists(USERS_FILE):
+    if not os.path.exists(USERS_FILE) and not user_store.all():
         initial_users = [
             {
                 'username': 'jim',
@@ -715,10 +913,18 @@ if __name__ == "__main__":
             }
         ]
         save_users(initial_users)
-    
-    if not os.path.exists(LOGS_FILE):
-        initial_logs = []
-        save_json_file(LOGS_FILE, initial_logs)
-    
-    app.run(host='0.0.0.0', port=44195)
 
+def create_app():
+    # WSGI entry point, `gunicorn -c gunicorn.conf.py "app:create_app()"`
+    init_data_files()
+    if not DEV:
+        assets.build()
+        images.build()
+    return app
+
+if __name__ == "__main__":
+    init_data_files()
+    if not DEV:
+        assets.build()
+        images.build()
+    app.run(host='0.0.0.0', port=44195)
@@ -0,0 +1,40 @@
+# Production server config:
+#
+#   gunicorn -c gunicorn.conf.py "app:create_app()"
+#
+# Graceful restart after a deploy: `kill -HUP <master pid>` starts fresh
+# workers and lets the old ones finish their requests (up to graceful_timeout).
+# With preload_app the code is loaded once in the master, so pick up code
+# changes with `kill -USR2 <master pid>` (new master) and then
+# `kill -TERM <old master pid>`.
+import multiprocessing
+import os
+
+# gevent workers, so slow upstream calls don't tie up a worker each (see
+# serve.py). The patching has to happen before the preloaded app imports
+# requests and ssl.
+worker_class = os.environ.get('WORKER_CLASS', 'gevent')
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    os.environ.setdefault('HTTP_MAX_PER_HOST', '64')
+    # sqlite3 calls block the worker's event loop, see serve.py
+    os.environ.setdefault('SQLITE_BUSY_TIMEOUT', '0.5')
+
+bind = os.environ.get('BIND', '0.0.0.0:44195')
+workers = int(os.environ.get('WORKERS', multiprocessing.cpu_count()))
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
+
+preload_app = True
+
+# LLM answers can take a couple of minutes, streamed ones even longer
+timeout = int(os.environ.get('WORKER_TIMEOUT', 300))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 60))
+keepalive = 5
+
+# recycle workers now and then so a slow leak can't build up on the Pi
+max_requests = int(os.environ.get('MAX_REQUESTS', 5000))
+max_requests_jitter = 500
+
+accesslog = os.environ.get('ACCESS_LOG')
+errorlog = '-'
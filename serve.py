@@ -0,0 +1,36 @@
+# Runs the panel on a gevent event loop instead of the threaded dev server.
+# monkey.patch_all() turns the blocking calls the tools make (requests,
+# sockets, git subprocesses, the batch thread pools) into cooperative ones,
+# so every request is a greenlet and a slow LLM answer or GitHub lookup just
+# parks its greenlet while other reviewers are served. Upstream concurrency
+# is still capped per host by utils.httpclient.
+#
+# SQLite is not patched: its calls run in C and block the event loop, every
+# greenlet included, for as long as they take. That's fine for the short
+# queries the panel makes, but a write waiting on another process's lock
+# would stall the whole server, so the busy timeout is cut down here.
+from gevent import monkey
+monkey.patch_all()
+
+import os
+import sys
+
+# many more calls can be in flight than with threads, let each upstream host
+# have a bigger connection pool unless it's configured explicitly
+os.environ.setdefault('HTTP_MAX_PER_HOST', '64')
+os.environ.setdefault('SQLITE_BUSY_TIMEOUT', '0.5')
+
+from gevent.pool import Pool
+from gevent.pywsgi import WSGIServer
+
+import app as panel
+
+HOST = os.environ.get('HOST', '0.0.0.0')
+PORT = int(os.environ.get('PORT', 44195))
+MAX_CONNECTIONS = int(os.environ.get('MAX_CONNECTIONS', 1000))
+
+if __name__ == "__main__":
+    server = WSGIServer((HOST, PORT), panel.create_app(), spawn=Pool(MAX_CONNECTIONS),
+                        log=sys.stdout if panel.DEV else None)
+    print(f"Serving on http://{HOST}:{PORT}")
+    server.serve_forever()
@@ -0,0 +1,23 @@
+from tools.answer_cache import AnswerCache, question_tokens
+
+
+def test_interrogatives_are_part_of_the_key():
+    cache = AnswerCache()
+    cache.set("What is Shiba?", "v1", "shiba is a ysws")
+    assert cache.get("When is Shiba?", "v1") is None
+    assert cache.get("Why Shiba?", "v1") is None
+    assert cache.get("what is shiba", "v1") == "shiba is a ysws"
+
+
+def test_negations_are_part_of_the_key():
+    cache = AnswerCache()
+    cache.set("Can I use AI for my project?", "v1", "yes")
+    assert cache.get("Can't I use AI for my project?", "v1") is None
+    assert question_tokens("Don't I need a README?") == ["not", "need", "readme"]
+
+
+def test_rephrasing_still_hits():
+    cache = AnswerCache()
+    cache.set("what is shadow granting", "v1", "answer")
+    assert cache.get("What's shadow granting?", "v1") == "answer"
+    assert cache.get("what is shadow granting", "v2") is None
@@ -0,0 +1,88 @@
+import os
+import subprocess
+
+import pytest
+
+from tools import repo_analysis
+from tools.github import parse_repo_url
+from tools.repo_analysis import GitError, analyze_repo, clone_path
+
+
+def commit(repo, name, email, when, filename, lines):
+    with open(os.path.join(repo, filename), "a") as f:
+        f.write("line\n" * lines)
+    env = dict(os.environ, GIT_AUTHOR_NAME=name, GIT_AUTHOR_EMAIL=email, GIT_AUTHOR_DATE=when,
+               GIT_COMMITTER_NAME=name, GIT_COMMITTER_EMAIL=email, GIT_COMMITTER_DATE=when)
+    subprocess.run(["git", "add", filename], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", filename], cwd=repo, env=env, check=True)
+
+
+@pytest.fixture
+def source(tmp_path):
+    repo = tmp_path / "source"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", "-b", "main", str(repo)], check=True)
+    commit(repo, "alice", "alice@example.com", "2025-01-06T04:00:00+00:00", "a.txt", 10)
+    commit(repo, "alice", "alice@example.com", "2025-01-06T04:01:00+00:00", "a.txt", 5)
+    commit(repo, "bob", "bob@example.com", "2025-01-07T15:00:00+00:00", "b.txt", 1200)
+    return repo
+
+
+def test_analyze_then_fetch_new_commits(source, tmp_path):
+    repo_analysis.analysis_cache.clear()
+    url = source.as_uri()
+    clone = str(tmp_path / "cache" / "source.git")
+
+    first = analyze_repo(url, clone)
+    assert first["total_commits"] == 3
+    assert first["authors"] == [{"name": "alice", "commits": 2}, {"name": "bob", "commits": 1}]
+    assert first["hour_histogram"][4] == 2 and first["hour_histogram"][15] == 1
+    assert first["weekday_histogram"][0] == 2 and first["weekday_histogram"][1] == 1
+    assert [c["lines"] for c in first["large_commits"]] == [1200]
+    assert analyze_repo(url, clone) is first
+
+    commit(source, "carol", "carol@example.com", "2025-01-08T22:00:00+00:00", "c.txt", 3)
+    second = analyze_repo(url, clone)
+    assert second["head_sha"] != first["head_sha"]
+    assert second["total_commits"] == 4
+    assert {"name": "carol", "commits": 1} in second["authors"]
+    assert second["hour_histogram"][22] == 1
+    # fetched into the existing clone, no ref named HEAD left behind
+    refs = subprocess.run(["git", "for-each-ref", "--format=%(refname)"], cwd=clone,
+                          capture_output=True, text=True, check=True).stdout.split()
+    assert refs == ["refs/heads/main"]
+
+
+def test_git_failures_raise_git_error(tmp_path, monkeypatch):
+    with pytest.raises(GitError):
+        analyze_repo((tmp_path / "missing").as_uri(), str(tmp_path / "cache" / "missing.git"))
+
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(GitError, match="could not run git"):
+        repo_analysis._git(["status"])
+
+    def slow(*args, **kwargs):
+        raise subprocess.TimeoutExpired(args[0], kwargs["timeout"])
+
+    monkeypatch.setattr(repo_analysis.subprocess, "run", slow)
+    with pytest.raises(GitError, match="timed out"):
+        repo_analysis._git(["fetch"])
+
+
+@pytest.mark.parametrize("url", [
+    "https://github.com/../jim",
+    "https://github.com/jim/..",
+    "https://github.com/./repo",
+    "https://github.com/jim/re%2Fpo",
+    "https://github.com/ji m/repo",
+])
+def test_bad_owner_or_repo_is_rejected(url):
+    with pytest.raises(ValueError):
+        parse_repo_url(url)
+
+
+def test_clone_path_stays_in_cache_dir(tmp_path):
+    cache = tmp_path / "cache"
+    assert clone_path(str(cache), "Jim", "Repo") == os.path.realpath(cache / "jim" / "repo.git")
+    with pytest.raises(ValueError):
+        clone_path(str(cache), "..", "..")
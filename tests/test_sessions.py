@@ -0,0 +1,62 @@
+from flask import Flask, session
+
+from utils.sessions import ServerSessionInterface, SessionStore
+
+
+def make_app(store):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = ServerSessionInterface(store)
+
+    @app.route('/visit')
+    def visit():
+        session['seen'] = True
+        return 'ok'
+
+    @app.route('/login/<name>')
+    def login(name):
+        session.regenerate()
+        session['username'] = name
+        return 'ok'
+
+    @app.route('/whoami')
+    def whoami():
+        return session.get('username', '')
+
+    return app
+
+
+def sid(client):
+    return client.get_cookie('session').value
+
+
+def test_login_rotates_session_id():
+    store = SessionStore()
+    client = make_app(store).test_client()
+
+    client.get('/visit')
+    before = sid(client)
+    client.get('/login/alice')
+    first = sid(client)
+    client.get('/login/bob')
+    second = sid(client)
+
+    assert len({before, first, second}) == 3
+    assert store.get(before) is None and store.get(first) is None
+    assert store.get(second)['username'] == 'bob'
+    assert client.get('/whoami').text == 'bob'
+
+
+def test_pre_login_id_is_useless_after_login():
+    store = SessionStore()
+    app = make_app(store)
+    attacker = app.test_client()
+    attacker.get('/visit')
+    planted = sid(attacker)
+
+    victim = app.test_client()
+    victim.set_cookie('session', planted)
+    victim.get('/login/alice')
+
+    assert sid(victim) != planted
+    assert attacker.get('/whoami').text == ''
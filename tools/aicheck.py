@@ -1,28 +1,58 @@
+from utils import httpclient
+from tools.github import API_ROOT, RAW_ROOT, GitHubError, conditional_get, parse_repo_url
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import requests
-from urllib.parse import urlparse
 
 API_URL = "https://ai.hackclub.com/chat/completions"
 MODEL = "qwen/qwen3-32b"
 
+README_NAMES = ["README.md", "readme.md", "Readme.md", "README.rst", "README.txt", "README"]
+FALLBACK_BRANCHES = ["main", "master"]
+
 def get_readme_from_github(repo_url):
 
-    parsed_url = urlparse(repo_url)
-    path_parts = parsed_url.path.strip("/").split("/")
-    if len(path_parts) < 2:
-        raise ValueError("Invalid GitHub repo URL")
-    owner, repo = path_parts[:2]
+    owner, repo = parse_repo_url(repo_url)
 
-    branches = ["main", "master"]
-    for branch in branches:
-        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/README.md"
-        r = requests.get(raw_url)
-        if r.status_code == 200:
-            return r.text
-    return None
+    # one metadata call finds the README on the default branch, whatever it's named
+    try:
+        return conditional_get(f"{API_ROOT}/repos/{owner}/{repo}/readme", accept="application/vnd.github.raw")
+    except GitHubError as e:
+        if e.status_code == 404:
+            return None
+    except requests.RequestException:
+        pass
 
-def detect_ai_probability(readme_text):
+    # API rate limited or unreachable, probe raw.githubusercontent.com instead
+    return _probe_raw_readme(owner, repo)
+
+def _probe_raw_readme(owner, repo):
+    candidates = [
+        f"{RAW_ROOT}/{owner}/{repo}/{branch}/{name}"
+        for branch in FALLBACK_BRANCHES
+        for name in README_NAMES
+    ]
+
+    def fetch(url):
+        try:
+            return conditional_get(url, accept="text/plain")
+        except (GitHubError, requests.RequestException):
+            return None
 
-    prompt = f"""
+    # all candidates are fetched at once, but the winner is the first hit in
+    # branch x name order, so a repo with both main and master (or README.md
+    # and README.rst) always gets the same README
+    pool = ThreadPoolExecutor(max_workers=len(candidates))
+    try:
+        for future in [pool.submit(fetch, url) for url in candidates]:
+            text = future.result()
+            if text is not None:
+                return text
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+PROMPT_TEMPLATE = """
 You are an expert AI text detector. Your task is to analyze the provided text and determine the probability that it was written by an AI (0.0-1.0).
 
 Analyze the text for human vs AI patterns as described below:
@@ -45,18 +75,71 @@ AI PATTERNS (higher AI probability 0.70-0.95):
 Provide your answer as a number between 0.0 (definitely human) and 1.0 (definitely AI). Only return the probability.
 
 Text to analyze:
-{readme_text[:2000]}
+{text}
 """
+
+# only the start of the README is sent to the model
+MAX_CHARS = 2000
+
+# cached results are keyed on the model and a hash of the prompt template,
+# so editing either one starts from a clean slate
+PROMPT_VERSION = hashlib.sha256(PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+
+result_cache = None
+
+def use_result_cache(cache):
+    global result_cache
+    result_cache = cache
+
+def result_cache_key(readme_text):
+    digest = hashlib.sha256(readme_text[:MAX_CHARS].encode("utf-8")).hexdigest()
+    return f"{MODEL}:{PROMPT_VERSION}:{digest}"
+
+def detect_ai_probability(readme_text):
+
+    if result_cache is not None:
+        cached = result_cache.get(result_cache_key(readme_text))
+        if cached is not None:
+            return cached
+
+    prompt = PROMPT_TEMPLATE.format(text=readme_text[:MAX_CHARS])
     
     payload = {
         "model": MODEL,
         "messages": [{"role": "user", "content": prompt}]
     }
     
-    response = requests.post(API_URL, json=payload)
+    response = httpclient.post(API_URL, json=payload)
     result = response.json()
     
-    return result['choices'][0]['message']['content'].strip()
+    ai_probability = result['choices'][0]['message']['content'].strip()
+    if result_cache is not None and _is_probability(ai_probability):
+        result_cache.set(result_cache_key(readme_text), ai_probability)
+    return ai_probability
+
+def _is_probability(ai_probability):
+    try:
+        float(ai_probability.split('</think>')[-1].strip())
+        return True
+    except ValueError:
+        return False
+
+def parse_ai_probability(ai_probability):
+    # the model answers with a bare float, sometimes after a <think> block
+    try:
+        if '<think>' in ai_probability and '</think>' in ai_probability:
+            parts = ai_probability.split('</think>')
+            if len(parts) > 1:
+                probability_str = parts[1].strip()
+                probability_float = float(probability_str)
+            else:
+                probability_float = 0.0
+        else:
+            probability_float = float(ai_probability)
+
+        return int(probability_float * 100)
+    except:
+        return 0
 
 if __name__ == "__main__":
     urls = [
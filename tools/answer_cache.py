@@ -0,0 +1,107 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from tools.retrieval import STOPWORDS
+
+# unlike retrieval, the cache has to keep the words that change what is
+# being asked: "when is X" and "what is X" need different answers
+QUESTION_WORDS = {"how", "what", "when", "where", "which", "who", "why"}
+FILLER = STOPWORDS - QUESTION_WORDS
+
+
+def question_tokens(question):
+    text = question.lower()
+    text = re.sub(r"\bcan'?t\b|\bcannot\b", "can not", text)
+    text = re.sub(r"\bwon'?t\b", "will not", text)
+    text = re.sub(r"n't\b", " not", text)
+    return [t for t in re.findall(r"[a-z0-9]+", text) if t not in FILLER]
+
+
+class AnswerCache:
+    # Chatbot answers keyed on the normalized question and the prompt version.
+    # A question that isn't cached verbatim can still hit if its token set is
+    # close enough (Jaccard >= threshold) to one that is, so "what is shadow
+    # granting" and "what's shadow granting?" share an answer.
+
+    def __init__(self, maxsize=256, ttl=12 * 3600, threshold=0.8):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(question):
+        tokens = frozenset(question_tokens(question or ""))
+        return tokens, " ".join(sorted(tokens))
+
+    def get(self, question, version):
+        tokens, normalized = self._normalize(question)
+        now = time.monotonic()
+
+        with self._lock:
+            if not tokens:
+                self.misses += 1
+                return None
+
+            key = (version, normalized)
+            entry = self._data.get(key)
+            if entry is not None and entry[0] >= now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+
+            best_key, best_score = None, 0.0
+            expired = []
+            for other_key, (expires_at, other_tokens, _) in self._data.items():
+                if expires_at < now:
+                    expired.append(other_key)
+                    continue
+                if other_key[0] != version:
+                    continue
+                score = len(tokens & other_tokens) / len(tokens | other_tokens)
+                if score > best_score:
+                    best_key, best_score = other_key, score
+            for other_key in expired:
+                del self._data[other_key]
+
+            if best_key is not None and best_score >= self.threshold:
+                self._data.move_to_end(best_key)
+                self.near_hits += 1
+                return self._data[best_key][2]
+
+            self.misses += 1
+            return None
+
+    def set(self, question, version, answer):
+        tokens, normalized = self._normalize(question)
+        if not tokens:
+            return
+        with self._lock:
+            key = (version, normalized)
+            self._data[key] = (time.monotonic() + self.ttl, tokens, answer)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,92 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tools.hackatime import get_user_stats, HackatimeError, STATS_FEATURES
+from tools.commits import get_commit_count
+from tools.aicheck import get_readme_from_github, detect_ai_probability, parse_ai_probability
+
+MAX_WORKERS = 8
+MAX_ROWS = 500
+
+HEADER_NAMES = ('slack_id', 'slack id', 'slackid')
+
+
+def parse_rows(text):
+    # accepts a CSV upload or rows pasted from a spreadsheet (tab separated):
+    # slack_id, project, github_url. Returns the first MAX_ROWS rows and how
+    # many were left out.
+    rows = []
+    for line in text.splitlines():
+        delimiter = '\t' if '\t' in line else ','
+        fields = [f.strip() for f in next(csv.reader([line], delimiter=delimiter), [])]
+        if not any(fields):
+            continue
+        if fields[0].lower() in HEADER_NAMES:
+            continue
+        fields += [''] * (3 - len(fields))
+        rows.append({
+            'slack_id': fields[0],
+            'project': fields[1],
+            'github_url': fields[2],
+        })
+    return rows[:MAX_ROWS], max(len(rows) - MAX_ROWS, 0)
+
+
+def check_row(row, check_readme=False):
+    result = dict(row, hours=None, commits=None, ratio=None, ai_score=None, errors=[])
+
+    if not row['slack_id'] or not row['project']:
+        result['errors'].append('missing slack id or project')
+    else:
+        try:
+            stats = get_user_stats(row['slack_id'], features=STATS_FEATURES)
+            projects = stats.get('data', {}).get('projects', [])
+            project = next((p for p in projects if p.get('name') == row['project']), None)
+            if project:
+                result['hours'] = round(project.get('total_seconds', 0) / 3600, 2)
+            else:
+                result['errors'].append(f'project "{row["project"]}" not found on hackatime')
+        except HackatimeError as e:
+            result['errors'].append(f'hackatime: HTTP {e.status_code}')
+        except Exception as e:
+            result['errors'].append(f'hackatime: {e}')
+
+    if row['github_url']:
+        try:
+            result['commits'] = get_commit_count(row['github_url'])
+        except Exception as e:
+            result['errors'].append(f'github: {e}')
+
+        if check_readme:
+            try:
+                readme = get_readme_from_github(row['github_url'])
+                if readme:
+                    result['ai_score'] = parse_ai_probability(detect_ai_probability(readme))
+                else:
+                    result['errors'].append('readme: not found')
+            except Exception as e:
+                result['errors'].append(f'readme: {e}')
+    else:
+        result['errors'].append('missing github url')
+
+    if result['commits'] is not None and result['hours']:
+        result['ratio'] = round(result['commits'] / result['hours'], 2)
+
+    return result
+
+
+def review_rows(rows, check_readme=False, max_workers=MAX_WORKERS):
+    # yields each row's result as soon as it finishes, not in input order
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            pool.submit(check_row, row, check_readme): index
+            for index, row in enumerate(rows)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            result['index'] = futures[future]
+            yield result
+    finally:
+        # the reviewer may close the page mid-run, don't keep fetching for nobody
+        pool.shutdown(wait=False, cancel_futures=True)
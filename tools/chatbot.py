@@ -1,22 +1,38 @@
-import requests
+from utils import httpclient
+import hashlib
 import json
+import os
 import re
+import threading
 from utils.date import get_date
+from tools.retrieval import BM25Index, split_catalog
+from tools.answer_cache import AnswerCache
 
-def ask_hackclub_ai(username: str, question: str, tune_file: str = "ai_tune.txt") -> str:
+CHAT_URL = "https://ai.hackclub.com/chat/completions"
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ysws_catalog.yml")
 
+# The system prompt is assembled from these pieces. The instructions below go
+# in a prefix that stays byte-identical between questions (and between days)
+# so the upstream can reuse its prompt cache. After it come only the catalog
+# entries, terms and notes that a BM25 search finds relevant to the question,
+# and the date last.
 
-    #with open(tune_file, "r", encoding="utf-8") as f:
-    #    system_prompt = f.read()
-    system_prompt = f"""
+RETRIEVAL_K = 6
 
-The current date is { get_date }!
+answer_cache = AnswerCache()
 
+INTRO = """\
 Your name is Lucy, after jim's cat that he couldn't keep.
 
 YSWS stands for "You Ship We Ship" and are programs made possible with Hack Club; Teenagers can pitch a YSWS idea and someone can sponsor it. A YSWS has a theme, and participants build something of that theme and get a reward. 
+"""
 
+TERMS_INTRO = """\
 Basic terms: (if a question is thrown to you about a term, give the meaning + tell them to go to https://ysws.jimdinias.dev/terminology for more)
+"""
+
+TERMS = """\
 PoC - PoC stands for Point of Contact. This is usually an intern who connects you to a full-time HQ staff member sponsoring the YSWS project.
 Sponsor - The Sponsor is the full-time HQ staff member who makes the YSWS possible. They oversee your PoC and provide funding through HCB.
 Unified DB - The Unified Database is an internal system where all approved YSWS submissions are stored. You can add a reviewed project to it using the Airtable automation tickbox.
@@ -24,1139 +40,21 @@ Weighted Grants - Weighted Grants measure contribution by tracking how many hour
 Override Hours Count - This is the manually adjusted estimate of how long it actually took to create the project, based on Hackatime or a reviewer’s judgment. It replaces the default grant hours if modified.
 Override Reason - The explanation for changing the default hours, including the number of hours chosen and details on how the project was tested or evaluated.
 Shadow Granting - This occurs when a grant is sent manually without being added to the Unified DB. This is considered a bad practice.
+"""
 
-
-
-These are all YSWS projects:
----
-limitedTime:
-- name: Shiba Arcade
-  description: Make a game with Godot, earn SSS, and get invited to build an arcade in Tokyo (flight stipends available!)
-  website: https://shiba.hackclub.com
-  slack: https://hackclub.slack.com/archives/C09AG5L0L03
-  slackChannel: '#shiba'
-  status: active
-  deadline: '2025-10-20T23:59:59'
-  detailedDescription: |
-    Shiba is a two-part adventure about game development. Create a game with Godot (an open-source game engine), earn SSS, use that for shop items, but most importantly, an invitation (and flight stipends) to Tokyo, Japan with 29 other Hack Clubbers to build a pop-up arcade!
-- name: birthday-cards
-  description: You ship a birthday themed project we ship a birthday card!
-  website: https://birthday-cards.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C099VPF7V3P
-  slackChannel: "#birthday-cards-ysws"
-  status: active
-  deadline: 2026-08-12
-- name: Armed
-  description: Develop an arm assembly program, get lego.
-  website: https://armed.hackclub.com
-  slack: https://hackclub.slack.com/archives/C098S1A5ZAT
-  slackChannel: '#armed'
-  status: active
-  deadline: '2025-09-01T23:59:59'
-- name: Optimize
-  description: Build a desktop app, optimize, get RAM, get Storage
-  website: https://optimize.hackclub.com
-  slack: https://hackclub.slack.com/archives/C096NH7FW4T
-  slackChannel: '#optimize'
-  status: active
-  deadline: '2025-08-22T23:59:59'
-- name: The Zoo
-  description: Make an animal themed Svelte site, earn Ikea Animal Plushies
-  website: https://zoo.hackclub.com
-  slack: https://hackclub.slack.com/archives/C08K37F66AK
-  slackChannel: "#the-zoo"
-  status: active
-  deadline: '2025-08-23T03:50:00'
-  detailedDescription: |
-    The Zoo is a Svelte YSWS where participants build an animal themed Svelte site and earn Mynts (currency) which can be turned into an HCB grant at the end to buy Ikea plushies. Get one giant Djungleskog, or multiple mini Blahaj, it's all up to you. Here's the best part: the better your submission is, the more Mynts you earn!
-- name: HackCraft
-  description: Create a Minecraft mod, get Stickers, Minecraft or a server and terraria!
-  website: https://hackcraft.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07NQ5QAYNQ
-  slackChannel: "#mc-modding"
-  status: active
-  detailedDescription: Join HackCraft to build and ship your own Minecraft mod. Access exclusive resources and a supportive community.
-  steps:
-  - Make a mod.
-  - Publish it on Modrinth.
-  - Submit your mod to Hack Club.
-  - Receive prizes and enjoy!
-  requirements:
-  - Basic knowledge of Java programming.
-  details:
-  - Participants will receive a Minecraft Java Edition account or server upon successful submission.
-  - Support is available through our Slack community.
-
-- name: Summer of Making
-  description: Build stuff. Get stuff. Repeat.
-  website: https://summer.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C015M4L9AHW
-  slackChannel: "#summer-of-making"
-  status: active
-  deadline: '2025-09-31T23:59:59'
-  participants: 10985
-- name: Hivemind
-  description: Create a roguelike in 7 days, get itch.io credit.
-  website: https://hivemind.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C096T7JRQRG
-  slackChannel: "#hivemind-"
-  status: active
-  deadline: '2025-08-07T23:59:59'
-  steps:
-  - Create a traditional roguelike in 7 days.
-  - Chronicle its development across 7 devlogs.
-  - Get $2.50 in itch.io credit for each approved hour you spend.
-- name: Authly
-  description: Build the weirdest and never-before-seen authentication system, get yubikeys, programmable nfc tags, antivirus giftcards and more!
-  website: https://authly.hackclub.com
-  slack: https://hackclub.slack.com/archives/C0963JU3CSD
-  slackChannel: "#authly"
-  status: active
-  deadline: '2025-08-31T23:59:59'
-- name: Gemini
-  description: Ship An Android App and get a FREE Android Phone + Dev License!
-  website: https://gemini.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C094VQKH1FV
-  slackChannel: "#gemini"
-  status: active
-  deadline: '2025-08-11T23:59:59'
-- name: Endpointer
-  description: Build a REST API, get a grant for Raspberry Pi or Cloud Credits
-  website: https://endpointer.hackclub.com
-  slack: https://hackclub.slack.com/archives/C097M5JRT7F
-  slackChannel: "#endpointer"
-  status: active
-  deadline: '2025-08-12T23:59:59'
-- name: Portal-VR
-  description: Build an AR/VR application, get a VR headset!
-  website: https://portalvr.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C096CPJ1HCN
-  slackChannel: "#portal-vr"
-  status: active
-  deadline: '2025-08-23T23:59:59'
-- name: Timeless
-  description: You have 10 days. Make a video game that could last someone 10 years.
-  website: https://timeless.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0956A8CL86
-  slackChannel: "#timeless"
-  status: active
-  deadline: '2025-07-24T23:59:59'
-- name: Toybox
-  description: You ship a daily game, we ship stickers + keycap keychain + steam gift card. Make the next Wordle.
-  website: https://toybox.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C096HCT11G9
-  slackChannel: "#toybox"
-  status: active
-  deadline: '2025-07-22T23:59:59'
-- name: Dummies
-  description: learn a new language, recieve a guide book!
-  website: https://dummies.hackclub.com/
-  deadline: 2025-08-21T23:59:59
-  detailedDescription: Join Dummies to take on projects in new languages and earn grant cards for books!
-  steps:
-  - Develop and publish a project
-  - Submit it to Hack Club
-  - Receive a grant for books!
-  requirements:
-  - taking on a NEW skill
-  - resulting project can be seen from a weblink
-  slack: https://app.slack.com/client/T0266FRGM/C096M3EV67M
-  slackChannel: "#Dummies"
-  status: active
-- name: Twist
-  description: Make an esolang, get stickers and a $40 electronics grant.
-  website: https://twist.hackclub.dev/
-  slack: https://hackclub.slack.com/archives/C092A93FA4X
-  slackChannel: "#twist-ysws"
-  status: ended
-  deadline: '2025-07-16T23:59:59'
-
-- name: Terminal Craft v3
-  description: Build and publish your own terminal program and earn a $60 grant
-  website: https://terminalcraft.hackclub.com
-  slack: https://hackclub.slack.com/archives/C08F58MT3GV
-  slackChannel: "#terminal-craft"
-  status: active
-  deadline: '2025-08-10T23:59:59'
-
-- name: iFrame
-  description: Draw or edit images using any programming language and we will hang your custom image on HQ wall and send a copy to you
-  website: https://iframe.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C098LMVKPCM
-  slackChannel: "#iframe"
-  status: active
-  deadline:
-
-- name: Slushies
-  description: Build a flask app, get $5 or $10 for slushies!
-  website: https://slushies.hackclub.com
-  slack: https://hackclub.slack.com/archives/C097GP305G8
-  slackChannel: "#slushies"
-  status: active
-  deadline: '2025-08-23T23:59:59'
-
-- name: Infinity
-  description: Build a website with an infinite realtime canvas, get awesome prizes!
-  website: https://infinity.hackclub.com
-  slack: https://hackclub.slack.com/archives/C098ARHLXFW
-  slackChannel: "#infinity"
-  status: active
-  deadline: '2025-08-22T23:59:59'
-
-- name: Tile
-  description: Build a tile, get a tile, tile the tiles!
-  website: https://tile.hackclub.com
-  slack: https://hackclub.slack.com/archives/C097E6ZAF99
-  slackChannel: "#tile"
-  status: active
-  deadline: '2025-08-18T23:59:59'
-
-- name: Minigame
-  description: A YSWS where you build "mini" 5 hour games and earn a $20 grant for each one! At the end everyone's games will be combined together to make a big Minigame collection!
-  website: https://minigame.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C093SSC3Z16
-  slackChannel: "#minigame"
-  status: active
-  deadline: '2025-07-18T23:59:59'
-
-- name: Squeak
-  description: Design a mouse case and receive the case and parts!
-  website: https://squeak.hackclub.com
-  slack: https://hackclub.slack.com/archives/C094458MVMX
-  slackChannel: "#squeak"
-  status: active
-  deadline: '2025-07-13T23:59:59'
-
-- name: Pathfinder
-  description: Make a custom PCB controller board and efidget
-  website: https://pathfinder.hackclub.com
-  slack: https://hackclub.slack.com/archives/C0943DE80E4
-  slackChannel: "#pathfinder"
-  status: active
-  deadline: '2025-07-05T23:59:59'
-  
-- name: Hackfinger
-  description: You design a custom appendage (finger, tail, leg, anything you want!) and get your design printed along with a custom control board.
-  website: https://hackfinger.hackclub.com
-  slack: https://hackclub.slack.com/archives/C095T0TQ5A8
-  slackChannel: "#hackfinger"
-  status: active
-  deadline: '2025-07-20T23:59:59'
-
-- name: Silicon
-  description: Design your own custom devboard and we'll fund it
-  website: https://silicon.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C090WQ9JBTM
-  slackChannel: "#silicon"
-  status: active
-  deadline: '2025-08-06T23:59:59'
-
-- name: Grounded
-  description: Onboard + Bin v2
-  website: https://grounded.hackclub.com
-  slack: https://hackclub.slack.com/archives/C0948RT0C1M
-  slackChannel: "#grounded"
-  status: active
-  deadline: null
-
-- name: Jumpstart
-  description: Game-dev YSWS running July 9th to Aug 9th ✨
-  website: https://jumpstart.hackclub.com
-  slack: https://hackclub.slack.com/archives/C0931T5SEH4
-  slackChannel: "#jumpstart"
-  status: active
-  deadline: '2025-08-09T23:59:59'
-
-- name: Reinforced
-  description: Build a game, build a bot to beat it, get compute to do more AI stuff.
-  website: https://reinforced.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C092JUZ7V7Y
-  slackChannel: "#reinforced"
-  status: active
-  deadline: '2025-07-18T23:59:59'
-
-- name: Decode
-  description: Learn how a tech product works (hardware + software) and we ship you a grant to make it yourself
-  website: https://decode.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C091GPYCAFL
-  slackChannel: "#decode"
-  status: active
-  deadline: '2025-07-10T23:59:59'
-
-- name: Storyboard
-  description: Make a visual novel, get $$ for merch/plushie
-  website: https://storyboard.hackclub.com
-  slack: https://hackclub.slack.com/archives/C095E84SE1X
-  slackChannel: "#storyboard"
-  status: active
-  deadline: '2025-07-13T23:59:59'
-
-- name: Pulse
-  description: Build a project using the Spotify API with 6 hours on Hackatime, get 3 months of Spotify Premium
-  website: https://pulse.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C090E7XUEA3
-  slackChannel: "#pulse"
-  status: active
-  deadline: '2025-07-11T23:59:59'
-
-- name: Journey
-  description: The smash-hit Hack Club event where you share insider details of whatever you're building.
-  website: https://journey.hackclub.com
-  slack: https://hackclub.slack.com/archives/example
-  slackChannel: "#journey"
-  status: ended
-  deadline: '2025-06-10T23:59:59'
-
-- name: Railway
-  description: Build a site with Ruby on Rails, receive stickers!
-  website: https://railway.hackclub.com
-  slack: https://hackclub.slack.com/archives/C094T1FL2KG
-  slackChannel: "#railway"
-  status: active
-  deadline: '2025-07-22T23:59:59'
-
-- name: Cinema
-  description: You ship a short story JavaScript animation using canvas. In return, we ship HQ-made caramel popcorn
-  website: https://cinema.hackclub.com
-  slack: https://hackclub.slack.com/archives/C0936AVS683
-  slackChannel: "#cinema"
-  status: ended
-  deadline: '2025-07-06T23:59:59'
-
-- name: Spatula
-  description: You ship an app or script that sends push notifications, we'll give you a $5 grant card so you can start sending SMS messages with your code!
-  website: https://spatula.hackclub.com
-  slack: https://hackclub.slack.com/archives/C093Q40FU3C
-  slackChannel: "#spatula"
-  status: ended
-  deadline: '2025-07-03T23:59:59'
-
-- name: Rewind
-  description: Make an app that runs on Windows XP, get stickers + super cool headphones from KOSS (the KTX Pro 1 or Porta Pros).
-  website: https://rewind.hackclub.com
-  slack: https://hackclub.slack.com/archives/C093ALFAW8K
-  slackChannel: "#rewind"
-  status: active
-  deadline: '2025-08-13T23:59:59'
-
-- name: Illumination
-  description: You build something with ESP32-S3 emulator, and we give you a super cool ESP32-S3 devboard, custom parts, and cloud credits!
-  website: https://illumination.hackclub.com
-  slack: https://hackclub.slack.com/archives/C091MS57D37
-  slackChannel: "#illumination"
-  status: active
-  deadline: '2025-07-16T23:59:59'
-
-- name: Overflow-hidden
-  description: ysws where you can't use a scrollbar
-  website: https://overflow-hidden.hackclub.com
-  slack: https://hackclub.slack.com/archives/C095HDJK3TQ
-  slackChannel: "#overflow-hidden"
-  status: active
-  deadline: '2025-07-21T23:59:59'
-
-- name: Swirl
-  description: Create a quality website with Scoops, get ice cream!
-  detailedDescription: Ship a static website (html + css) that has a Scoop, and get a grant for ice cream to enjoy! Scoops are made up of groups of three html / css features that add something of value to the website.
-  website: https://swirl.hackclub.com
-  slack: https://hackclub.slack.com/archives/C08FR0LMVHD
-  slackChannel: "#swirl"
-  status: active
-  deadline: '2025-08-03T23:59:59'
-  participants: 40
-
-- name: Grub
-  description: 'You Ship A responsive website using only HTML and Tailwind CSS. We Ship A grant for junk food.'
-  detailedDescription: "The grant amount is based on the number of unique features implemented:\\n$6 (Basic Meal): For 2 unique features.\\n$8 (Refreshment Combo): For 4 unique features.\\n$10 (Full Combo Meal): For 6 or more unique features."
-  website: https://grub.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C08S9NCEULB
-  slackChannel: "#grub"
-  status: active
-  deadline: '2025-08-03T23:59:59'
-
-- name: Toppings
-  description: You ship an interactive website using framework-less JavaScript, we ship you a grant to an ice cream parlor.
-  website: https://toppings.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C08R8V2E3LY
-  slackChannel: "#toppings"
-  status: active
-  deadline: '2025-08-03T23:59:59'
-
-- name: Waffles
-  description: You ship a website using HTML CSS and JavaScript, and get Waffles!!!
-  website: https://waffles.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C08QBKX5WCD
-  slackChannel: "#waffles"
-  status: active
-  deadline: '2025-08-03T23:59:59'
-
-
-- name: Hackmate
-  description: Build a collaborative app, get upto $50 for cloud credits or a raspberry pi
-  website: https://hackmate.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C092HR1LG20
-  slackChannel: "#hackmate"
-  status: active
-  deadline: '2025-07-17T23:59:59'
-- name: Converge
-  description: Build Discord/Slack bots, we ship domain names, server hosting, Blahajs, and more
-  website: https://converge.hackclub.com/?utm_source=ysws-site
-  slack: https://hackclub.slack.com/archives/C091UF79VDM
-  slackChannel: "#converge"
-  status: active
-  deadline: '2025-07-15T23:59:59'
-- name: Reactive
-  description: Ship a website built with React, get $15 to buy a domain.
-  website: http://reactive.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C090S7Q2HT4
-  slackChannel: "#reactive"
-  status: active
-  deadline: '2025-07-04T23:59:59'
-  requirements:
-   - Basic knowledge of HTML and CSS
-   - A little knowledge of JavaScript
-- name: Gamefolio
-  description: Make a interactive portfolio website, get $20 for hosting or domains
-  website: http://gamefolio.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C08RT4C2485
-  slackChannel: "#gamefolio"
-  status: active
-  deadline: '2025-07-02T23:59:59'
-- name: Extensify
-  description: Build an IDE extension, get a keychain or a premium theme for VS Code or Sublime Text!
-  website: https://extensify.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C094H3V1Y81
-  slackChannel: "#extensify"
-  status: active
-  deadline: '2025-07-07T23:59:59'
-- name: Waveband
-  description: Create a program that uses RTL-SDR, and Hack Club sends you a dongle and antenna kit.
-  website: https://waveband.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C082S5V95G8
-  slackChannel: "#waveband"
-  status: active
-  deadline: '2025-07-11T23:59:59'
-- name: cmd + k
-  description: Build a Raycast extension, get Raycast Pro & stickers 
-  website: https://cmd-k.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0981BXG124
-  slackChannel: "#cmd-k"
-  status: active
-  deadline: '2025-08-17T23:59:59'
-- name: Toolsmith
-  description: Build a AI extension (MCP tool), get $10 of AI credits.
-  website: https://toolsmith.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C094X38BFT5
-  slackChannel: "#toolsmith"
-  status: active
-  deadline: '2025-07-11T23:59:59'
-- name: Smelt
-  description: Ship a Svelte/SvelteKit site, get awesome collectable swag!
-  website: https://smelt.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C09535Y8E83
-  slackChannel: "#smelt"
-  status: active
-  deadline: '2025-07-31T23:59:59'
-- name: Highway
-  description: Make any hardware project, get up to 350 USD to build it! Keyboard, game console, rocket, robot, 3d printer, etc... Then, go to a 4-day hardware hackathon @ Github HQ this summer!
-  detailedDescription:
-  website: https://highway.hackclub.com
-  slack: https://hackclub.slack.com/archives/C08Q1H6D79B
-  slackChannel: "#highway"
-  status: active
-  deadline: '2025-07-31T23:59:59'
-- name: Cafe
-  description: Collect cups, progress the graph, earn bonuses!
-  detailedDescription: Work on a personal project in a huddle, get a cup every hour. Getting certain amounts of cups can get you special prizes! See the cafe-bulletin channel for more information!
-  website:
-  slack: https://hackclub.slack.com/archives/C02A74Z7G7L
-  slackChannel: "#cafe"
-  status: ended
-  deadline: '2025-02-17T23:59:59'
-- name: RaspAPI
-  description: Make an API get a Raspberry Pi
-  detailedDescription: Create an original API using any programming language or framework that you prefer and get a Raspberry Pi Zero 2 W to host it on! The API can be anything you want. The possibilities are endless!
-  website: https://raspapi.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07UZSKJQRX
-  slackChannel: "#raspapi-ysws"
-  status: active
-  deadline: '2025-03-10T23:59:59'
-- name: Black Box
-  description: Create a constrained, interactive C program and get a portable device to run it on!
-  website: https://blackbox.hackclub.com
-  slack: https://hackclub.slack.com/archives/C08APN1CKEJ
-  slackChannel: "#black-box"
-  status: active
-  deadline: '2025-03-29T23:59:59'
-- name: Hackpad
-  description: Design a keyboard get the parts! Please note this is only open to those who have build a Macropad previously.
-  website: https://github.com/hackclub/hackpad
-  slack: https://hackclub.slack.com/archives/C07LESGH0B0
-  slackChannel: "#hackpad"
-  status: active
-  deadline: '2025-03-16T23:59:59'
-  participants: 719
-- name: Sidequests
-  description: A short-run low-volume low-effort ysws series from nora & co.
-  detailedDescription: |
-    #1: SkinAmp (ft. phoebe!) - Ship a WinAmp skin, we'll send you the WinAmp source code on CD-R (started 2025-03-26, ended 2025-04-13).
-    #2: gemerald - Write something useful in Ruby, i'll send you a sticker (best few get a book!) (started 2025-04-10, ended 2025-04-25).
-  website: https://sidequests.hackclub.com/
-  slack: https://slack.com/archives/C08KCUK3NF5
-  slackChannel: "#sidequests"
-  status: ended
-- name: Lockin
-  description: Work on anything Wakatime-able on call with another Hack Clubber, spin for stickers at the end of the session.
-  website: https://lockin.hackclub.com/
-  slack: https://slack.com/archives/C08JV3ZV1DY
-  slackChannel: "#lock-in"
-  status: active
-- name: BrowserBuddy
-  description: Build a Chrome extension, and Hack Club provides $30 to launch it on Chrome Web Store.
-  website: https://browserbuddy.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07MQBTNVRU
-  slackChannel: "#browser-buddy"
-  status: active
-  deadline: '2025-03-19T23:59:59'
-  participants: 22
-- name: TerminalCraft
-  description: Build a terminal program and earn a Raspberry Pi 4
-  detailedDescription: Build & publish a cross-platform terminal app. Get 10 users, open-source it, and snag your Pi 4
-  website: https://terminalcraft.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C08F58MT3GV
-  slackChannel: "#terminal-craft"
-  status: active
-  deadline: '2025-06-21T23:59:59'
-- name: Pixeldust
-  description: Make a neopixel based PCB, get the parts to make one!
-  detailedDescription: Create a PCB using KiCad / other EDA. It should use neopixels and a Xiao RP2040, and act as a decoration. Once submitted you can get the parts to make one yourself!
-  website: https://pixeldust.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0895PXH53M
-  slackChannel: "#pixeldust"
-  status: active
-  deadline: '2025-04-13T23:59:59'
-- name: Juice
-  description: Spend 100 hours in 2 months building a game, and we'll cover your Steam release and fund a flight to China for a pop-up shop.
-  website: https://juice.hackclub.com
-  slack: https://hackclub.slack.com/archives/C088UF12N1Z
-  slackChannel: "#juice"
-  status: active
-  deadline: '2025-04-01T23:59:59'
-- name: Jungle
-  description: Spend time working on your game, get money to help publish it! Prizes include steam license, itch.io asset store credits, and much much more!
-  website: https://juice.hackclub.com/jungle 
-  slack: https://hackclub.slack.com/archives/C086MACKK43
-  slackChannel: "#jungle"
-  status: active
-  deadline: '2025-04-01T23:59:59'
-- name: Infill
-  description: Design your own 3D printer mod, get $20 to build it!
-  website: https://github.com/hackclub/infill
-  slack: https://hackclub.slack.com/archives/C08B7LF58TX
-  slackChannel: "#infill"
-  status: active
-  deadline: '2025-05-04T23:59:59'
-  participants: 380
-- name: Visioneer
-  description: Give your computer the gift of vision, get an esp32-s3-eye to see it through!
-  website: https://visioneer.hackclub.com
-  slack: https://hackclub.slack.com/archives/C082PCKJYMN
-  slackChannel: "#visioneer"
-  status: active
-  deadline: '2025-04-20T23:59:59'
-- name: Hacklet
-  description: Spend two hours building a creative javascript bookmarklet, get $10 to buy a domain! 
-  website: http://hackclub.github.io/hacklet
-  slack: https://hackclub.slack.com/archives/C08PJMATU8Y
-  slackChannel: "#hacklet"
-  status: active
-  deadline: '2025-05-10T23:59:59'
-- name: Asylum
-  description: Fast-paced hardware YSWS challenges.
-  website:
-  slack: https://hackclub.slack.com/archives/C083CCAAHM1
-  slackChannel: "#asylum"
-  status: ended
-  deadline: '2024-12-31T23:59:59'
-- name: Printboard
-  description: Design a 3D model that goes with the Ikea Skadis pegboard, and we will send you one!
-  website: https://printboard.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0853M4PCUA
-  slackChannel: "#printboard"
-  status: ended
-  deadline: '2025-02-16T23:59:59'
-  participants: 94
-- name: Minus Twelve
-  description: Create a useful tool and receive a shiny new microcontroller!
-  website: https://minustwelve.hackclub.com
-  slack: https://hackclub.slack.com/archives/C087S82MNFR
-  slackChannel: "#minus-twelve"
-  status: ended
-  deadline: '2025-01-27T23:59:59'
-- name: Hackapet
-  description: Make a pet game, get a hackable tamagotchi clone!
-  website: https://hackapet.hackclub.dev
-  slack: https://hackclub.slack.com/archives/C0809PN4TPE
-  slackChannel: "#hackapet"
-  status: ended
-  deadline: '2025-02-03T23:59:59'
-- name: Dessert
-  description: Make an Android app and earn a paid Google Developer account.
-  website:
-  slack: https://hackclub.slack.com/archives/C07N06B1FDY
-  slackChannel: "#dessert"
-  status: ended
-  deadline: '2025-01-10T23:59:59'
-- name: Solder
-  description: Design and solder your own custom PCB with a free electronics kit!
-  website: https://solder.hackclub.com/
-  slack: https://slack.com/archives/C08L288G22Y
-  slackChannel: "#solder"
-  status: active
-  deadline: '2025-06-30T23:59:59'
-- name: Cascade
-  description: Create animations with CSS and receive art supplies.
-  website: https://cascade.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07QA8HD48N
-  slackChannel: "#cascade-ysws"
-  status: active
-  deadline: '2024-12-14T23:59:59'
-  participants: 55
-- name: Riceathon
-  description: Customize your Linux install, and get programmer socks or a Blåhaj.
-  website: https://github.com/HackClub/riceathon
-  slack: https://hackclub.slack.com/archives/C07MLF9A8H5
-  slackChannel: "#riceathon"
-  status: active
-  deadline: '2025-01-10T23:59:59'
-  participants: 64
-- name: Hacky Holidays
-  description: Design a PCB holiday decoration this winter, get one shipped.
-  website: https://hacky-holidays.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C083SK3G5D3
-  slackChannel: "#hacky-holidays"
-  status: ended
-  deadline: '2025-01-31T23:59:59'
-- name: BakeBuild
-  description: Design a cookie cutter, get it shipped!
-  detailedDescription: "You ship : A CAD model of a cookie cutter, we ship : A 3D printed model of your custom cookie cutter & cookies!"
-  website: https://bakebuild.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0844MV2JM9
-  slackChannel: "#bakebuild"
-  status: active
-- name: Retrospect (J2ME edition)
-  description: Create a J2ME game (Java MIDlet) and have it delivered on a J2ME-capable phone.
-  website: https://retrospect.hackclub.com/j2me
-  slack: https://hackclub.slack.com/archives/C07MUFXNG82
-  slackChannel: "#retrospect"
-  status: active
-  deadline: '2025-04-07T23:59:59'
-- name: Hackaccino
-  description: Build a 3D website and get a free frappuccino.
-  website: https://fraps.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C078DFVL5LZ
-  slackChannel: "#fraps"
-  status: active
-  deadline: '2025-06-30T23:59:59'
-  participants: 362
-- name: Cider
-  description: Create an iOS app and receive a $100 Apple Developer account to publish it.
-  website: https://cider.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C073DTGENJ2
-  slackChannel: "#cider"
-  status: active
-  deadline:
-  participants: 34
-- name: Clutter
-  description: You ship something to organize your digital life. We ship you a grant to buy something to organize your physical life.
-  website: https://clutter.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0997C887M3
-  slackChannel: "#clutter"
-  status: active
-  deadline: '2025-09-17T23:59:59'
-- name: 10 Days of Tarot
-  description: Build a project or feature and get exclusive prizes for each card requirement you hit.
-  website: https://tarot.hackclub.com/
-  slack: https://slack.com/archives/C08L60RUQ92
-  slackChannel: "#10-days-of-tarot"
-  status: active
-  deadline: '2025-04-13T23:59:59'
-- name: Thunder
-  description: 'You Ship A Slack bot. We Ship A limited edition Orpheus bucket hat.'
-  website:
-  slack: https://hackclub.slack.com/archives/C06V2GEV3MY
-  slackChannel: "#thunder"
-  status: active
-  deadline: '2025-07-15T23:59:59'
-- name: Shipwrecked
-  description: 'You Ship 60 hours of work, 4 projects, and go viral. We Ship A ticket to an island hackathon in Boston.'
-  detailedDescription: 'You ship 60 hours of coding work, four shipped projects, and make one of them go viral. We ship you a ticket to Shipwrecked, a four-day, in-person hackathon on Cathleen Stone Island in the Boston Harbor, with travel stipends available.'
-  website: https://shipwrecked.hackclub.com
-  slack: https://hackclub.slack.com/archives/C073L9LB4K1
-  slackChannel: "#shipwrecked"
-  status: active
-  deadline: '2025-08-08T15:00:00'
-- name: Neighborhood
-  description: 'You Ship 100 hours of coding on one project. We Ship A free summer of coding in San Francisco.'
-  detailedDescription: 'You ship 100 hours of coding work on a single, new, open-source project. We ship you a flight to San Francisco and cover your housing, food, and transit for up to three months while you code with other teenagers.'
-  website: https://neighborhood.hackclub.com
-  slack: https://hackclub.slack.com/archives/C073L9LB4K1
-  slackChannel: "#neighborhood"
-  status: ended
-  # deadline: '2025-08-31T23:59:59' # Neighborhood was ended early
-- name: Fusering
-  description: "Design a keyring, get your keyring and a carabiner to hang it from!"
-  website: https://fusering.hackclub.com
-  slackChannel: "#fusering"
-  slack: https://hackclub.slack.com/archives/C098U42PD2A
-  status: active
-  deadline: '2025-09-30T23:59:59'
-indefinite:
-- name: Sprig
-  description: Build a JS game and play it on your own console.
-  website: https://sprig.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C02UN35M7LG
-  slackChannel: "#sprig"
-  status: active
-  participants: 657
-- name: OnBoard
-  description: Design a PCB and we'll fabricate it for you.
-  website: https://hackclub.com/onboard
-  slack: https://hackclub.slack.com/archives/C056AMWSFKJ
-  slackChannel: "#electronics"
-  status: ended
-  participants: 1000
-- name: Boba Drops
-  description: Build a website and get boba!
-  website: https://boba.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C06UJR8QW0M
-  slackChannel: "#boba"
-  status: active
-  participants: 1253
-- name: OnBoard Live
-  description: Design a PCB live on YouTube for $5/hour PCB credit.
-  website:
-  slack: https://hackclub.slack.com/archives/C07F3EA2L8G
-  slackChannel: "#onboard-live"
-  status: active
-drafts:
-- name: issued
-  description: code to design hack-themed apparel
-  detailedDescription: you code to design hack-themed apparel, we ship popular designs as real clothes!
-  website: https://issued-ysws.vercel.app
-  slack: https://hackclub.slack.com/archives/C09C9M0N2UC
-  slackChannel: "#issued"
-  status: draft
-- name: Swatchbox
-  description: You ship a modular art component, we ship the swatchbox to go with it!
-  website:
-  slack: https://hackclub.slack.com/archives/C094R49MS9Y
-  slackChannel: "#swatchbox"
-  status: draft
-- name: Rube Goldburg YSWS
-  description: 
-  website:
-  slack: https://hackclub.slack.com/archives/C094U05FAE6
-  slackChannel: "#rube-goldberg-ysws"
-  status: draft
-- name: Poetry
-  description: "You ship: poetry (details to be decided soon) We ship: Maybe a poster or smth?"
-  website:
-  slack: "#poetry-ysws"
-  slackChannel: https://hackclub.slack.com/archives/C095DDUVCJX
-  status: draft
-- name: Plunge
-  description: DESIGN A PLUNGER-STYLE COOKIE CUTTER, GET IT SHIPPED!
-  website: http://plunge.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C0955KVD1SA
-  slackChannel: "#plunge"
-  status: draft
-- name: Aquarium
-  description:
-  website:
-  slack: https://hackclub.slack.com/archives/C095PTABEJK
-  slackChannel: "#aquarium"
-  status: draft
-- name: Apogee
-  description: a rocketry ysws - still workshopping the idea!
-  website: 
-  slack: https://hackclub.slack.com/archives/C095RKGV5J4
-  slackChannel: "#apogee"
-  status: draft
-- name: Slushies
-  description: Earn $5 for deploying your Flask app (WIP)
-  website: https://slushies.vercel.app/
-  slack: https://hackclub.slack.com/archives/C097GP305G8
-  slackChannel: "#slushies"
-  status: draft
-- name: Glossarium
-  description: You ship anything that can provide knowledge (a comic, a tutorial, a how-to...) We ship a zine from Julia Evans
-  website: https://mathiasdpx.github.io/glossarium/
-  slack: https://hackclub.slack.com/archives/C096L6J19PY
-  slackChannel: "#glossarium"
-  status: draft
-- name: Hacksaber
-  description: An (not official) YSWS that you make an beat saber mod or custom map and we give beat saber copy
-  website:
-  slack: https://hackclub.slack.com/archives/C096K1ZEXDL
-  slackChannel: "#hacksaber"
-  status: draft
-- name: Hack A Home
-  description: You Ship a Home Assistant with Software,PCB and Case, We Ship a grant ($150 Max)to make it. 
-  detailedDescription: |
-    Build a home assistant with Software,PCB and Case . We will send u a grant ($150 Max)to make it.
-  website:
-  slack: https://hackclub.slack.com/archives/C08N4UN6AUS
-  slackChannel: "#hack-a-home"
-  status: draft
-- name: Hackumentary
-  description: You Ship a project with dev vlogs, We Ship points through which you can buy goodies 
-  detailedDescription: |
-    Build a project with daily dev vlogs, we ship you points for every dev vlog you create, which you can use to purchase exciting goodies after shipping your project
-  website:
-  slack: https://hackclub.slack.com/archives/C08NH401M2S
-  slackChannel: "#hackumentary"
-  status: draft
-- name: Reef
-  description: Ship a deep learning project (AI/ML/LLM/NN), get a custom coral based accelerator.
-  website:
-  slack: https://hackclub.slack.com/archives/C08K33ZUUR5
-  slackChannel: "#reef"
-  status: draft
-- name: Hackducky
-  description: Create A DuckyScript get a Rubber Ducky ! ( hackducky )
-  website:
-  slack: https://hackclub.slack.com/archives/C08B8HZBC85
-  slackChannel: "#hackducky"
-  status: draft
-- name: HackABand
-  description: ship a wristband design and we ship you fabric woven wristband with NFC chip
-  website: https://hackaband.vercel.app/
-  slack: https://hackclub.slack.com/archives/C089WSLC59V
-  slackChannel: "#hack-a-band"
-  status: draft
-- name: Forge
-  description: Design a 3D model that solves a problem and receive a custom 3D printer.
-  website: https://forge.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C078GBDKC03
-  slackChannel: "#forge-updates"
-  status: draft
-- name: Vine
-  description: Create a song using open-source music software and receive a vinyl with your song.
-  website: https://vineysws.vercel.app/
-  slack: https://hackclub.slack.com/archives/C07N0VA3YGJ
-  slackChannel: "#vine-ysws"
-  status: draft
-- name: Hack Store
-  description: Use a free alternative app store and get a Google Developer account.
-  website: https://www.hackstore.dev/
-  slack: https://hackclub.slack.com/archives/C07BGFG6CDQ
-  slackChannel: "#hack-store"
-  status: draft
-- name: Light Up
-  description: Design an electronic circuit with lights, and Hack Club sends you the components and gifts.
-  website:
-  slack: https://hackclub.slack.com/archives/C07RNEJ13LJ
-  slackChannel: "#lightup-ysws"
-  status: draft
-- name: Aether
-  description: Build a Windows app, and Hack Club provides a Microsoft Store developer account.
-  website:
-  slack: https://hackclub.slack.com/archives/C07V78URSGL
-  slackChannel: "#aether-ysws"
-  status: draft
-- name: Onward
-  description: Build a robot using Arduino and receive one.
-  website:
-  slack: https://hackclub.slack.com/archives/C079G5MKC93
-  slackChannel: "#onward"
-  status: draft
-- name: Fishin Chips
-  description: Build TTL logic circuits without microcontrollers, get components to make them real!
-  detailedDescription: This is a TTL (transistor-transistor logic) YSWS, which means no microcontrollers will be given! Build fundamental digital electronics like adders, clocks, or even a 4-bit computer. Dream big, but focus on the electronic fundamentals.
-  website:
-  slack: https://hackclub.slack.com/archives/C089UMGEL82
-  slackChannel: "#fishin-chips"
-  status: draft
-- name: PicoJam
-  description: Create a PICO-8 game, get a PICO-8 license for free!
-  detailedDescription: Use PICO-8 Education Edition to build a game with your own assets (art, sound effects, etc). Your game should have a basic goal and at least 2 minutes of gameplay. The top winner will receive a Physical PICO-8 Emulator Device!
-  website:
-  slack: https://hackclub.slack.com/archives/C08CLJ29RA9
-  slackChannel: "#picojam"
-  status: draft
-- name: Hack the Line
-  description: Get an Asterisk server running, and we'll send you a VoIP phone.
-  website:
-  slack: https://hackclub.slack.com/archives/C08B6PHLADU
-  slackChannel: "#hacktheline"
-  status: draft
-- name: Constellation
-  description: You ship a self host, full stack website, we ship a Raspberry Pi Zero 2 W to host it on
-  website:
-  slack: https://slack.com/archives/C07TQPAGAMA
-  slackChannel: "#constellation"
-  status: ended
-- name: The Zoo
-  description: You ship an interactive animal themed website, we ship themed stickers and posters for top submissions
-  website:
-  slack: https://slack.com/archives/C08K37F66AK
-  slackChannel: "#the-zoo"
-  status: draft
-- name: Jetsu
-  description: You ship a ML Robot, We ship a Jetson Nano / Jetson Orin Nano
-  detailedDescription: |
-    Event Dates: 1st June to 31st July
-    Participants will receive the necessary funding to build their robots.
-    Before funding, participants must:
-      - Submit a Bill of Materials (BOM) listing the expected components.
-      - Submit their initial machine learning project on GitHub with a well-documented README.
-    Machine learning models will be developed on laptops to control the robots.
-    Coding activity will be tracked using WakaTime.
-    Participants must log their work hours in a detailed project journal.
-    Rewards & Incentives:
-      - All participants who successfully complete the project will receive a Jetson Nano Developer Kit (4GB).
-      - Those who invest 100+ hours will be rewarded with a NVIDIA Jetson Orin (8GB).
-  website: https://jetsu.vercel.app
-  slack: https://slack.com/archives/C08GPNV0P0W
-  slackChannel: "#jetsu"
-  status: draft
-  deadline: '2025-07-31T23:59:59'
-- name: Hackclub market
-  description: You can buy/sell pcb's online
-  website: https://market.hackclub.com
-  slack: https://app.slack.com/client/T0266FRGM/C089VQAULJ0
-  slackChannel: "#hack-club-market"
-  status: draft
-- name: Lightsaber
-  description: You ship a beat saber map, we ship a(n) <undecided>.
-  website:
-  slack: https://slack.com/archives/C08C8PC40BA
-  slackChannel: "#lightsaber"
-  status: draft
-- name: Turquoise
-  description: You ship a linux distro, we ship a custom Hack Club skirt
-  website:
-  slack: https://slack.com/archives/C08BAEP4SCX
-  slackChannel: "#turquoise"
-  status: draft
-- name: Wetube
-  description: You ship a YouTube channel, we ship points for every video to spend on video equipment!
-  website: https://wetubeysws.vercel.app/
-  slack: https://slack.com/archives/C07U8QM9MEF
-  slackChannel: "#wetube"
-  status: draft
-- name: Mini MIDI Magic
-  description: You ship a custom MIDI Synth/Controller with the firmware, we make it and send it to you!
-  website:
-  slack: https://slack.com/archives/C081ZV47Z8D
-  slackChannel: "#mini-midi-magic"
-  status: draft
-- name: Glyphic
-  description: You Ship a cool and advanced Manim animation visualizing something, We Ship a Lamy Safari Fountain Pen
-  website:
-  slack: https://slack.com/archives/C087E2VDBL3
-  slackChannel: "#glyphic"
-  status: draft
-- name: Pridehaj
-  description: You ship a pride themed website, we ship a blahaj
-  website:
-  slack: https://slack.com/archives/C08BL0ELHLJ
-  slackChannel: "#pridehaj"
-  status: draft
-- name: Hack Drive
-  description: You Ship a cool filesystem/something using FUSE, We Ship a Hack Club branded flash drive
-  website: https://hackdrive.radi8.dev/
-  slack: https://slack.com/archives/C08EDPJ544E
-  slackChannel: "#hackdrive-ysws"
-  status: draft
-- name: Hackmouse
-  description: Design a PCB & case for a mouse and get the parts shipped to you.
-  website:
-  slack: https://slack.com/archives/C08JYC7RQT1
-  slackChannel: "#hackmouse"
-  status: draft
-- name: The Ride
-  description: You ship a PCB to go on an adventure, we give you the opportunity to build an (offroad) bike at HQ and go on that adventure.
-  website:
-  slack: https://slack.com/archives/C08L5UZTH0X
-  slackChannel: "#the-ride"
-  status: draft
-- name: Trainix
-  description: Build an RL model for math problems and win an ESP32-S3 + OLED Module. Top 3 get an NVIDIA Jetson Orin Nano Developer Kit.
-  website:
-  slack: https://hackclub.slack.com/archives/C08M1F3DYSE
-  slackChannel: "#trainix"
-  status: draft
-- name: RPG
-  description: Work together with other hack clubbers to fight bosses and earn awesome loot and an exclusive trading card for those who help defeat each boss!
-  website: https://rpg.hackclub.com/
-  slack: https://slack.com/archives/C08JCNN7C59
-  slackChannel: "#rpg"
-  status: draft
-- name: Pyramid Scheme
-  description: Put up Hack Club posters to earn prizes.
-  website:
-  slack: https://hackclub.slack.com/archives/C07N1TCHY3T
-  slackChannel: "#pyramid-scheme"
-  status: ended
-  ended: Ended December 10th
-- name: 15 Days in Public
-  description: Learn, build, or do something everyday for 15 days and post progress reports.
-  website:
-  slack: https://hackclub.slack.com/archives/C045S4393CY
-  slackChannel: "#15-days-in-public"
-  status: ended
-  ended: '2025-03-09T23:59:59'
-- name: Sock
-  description: Collaborate on a project for 10 days, get Hack Club socks!
-  website:
-  slack: https://hackclub.slack.com/archives/C08DPRYMWF8
-  slackChannel: "#sock"
-  status: ended
-  ended: '2025-03-01T23:59:59'
-- name: Easel
-  description: Build a programming language, get fudge.
-  website: https://easel.hackclub.com/orpheus-finds-easel
-  slack: https://hackclub.slack.com/archives/C06T22ZFQGP
-  slackChannel: "#easel"
-  status: ended
-  ended: '2024-06-30T23:59:59'
-- name: Blot
-  description: Write code, make art, and get a drawing machine.
-  website: https://blot.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C04GCH8A91D
-  slackChannel: "#blot"
-  status: ended
-  ended: '2024-11-23T23:59:59'
-  participants: 192
-- name: Boba Manor
-  description: Website building with rewards.
-  website: https://manor.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C06UJR8QW0M
-  slackChannel: "#boba"
-  status: ended
-  ended: Ended October 31st
-- name: Retrospect
-  description: Create a DOS game and have it delivered on a floppy disk.
-  website: https://retrospect.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07MUFXNG82
-  slackChannel: "#retrospect"
-  status: ended
-  ended: Ended October 8th
-- name: LLM YSWS
-  description: Projects using language models.
-  website:
-  slack: https://hackclub.slack.com/archives/C07KYNWR10W
-  slackChannel: "#llm / #zrl-land"
-  status: ended
-  ended: Ended October 1st
-  participants: 20
-- name: Arcade
-  description: The summer is yours for the making
-  website: https://hackclub.com/arcade
-  slack: https://hackclub.slack.com/archives/C06SBHMQU8G
-  slackChannel: "#hack-hour"
-  status: ended
-  ended: Ended September 1st
-  participants: 1229
-- name: The Bin
-  description: Hardware-related projects.
-  website: https://bin.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C01FXNNF6F2
-  slackChannel: "#electronics"
-  status: ended
-  ended: Ended September 30th
-  participants: 277
-- name: HAM Radio YSWS
-  description: Related to HAM radio projects.
-  website:
-  slack: https://hackclub.slack.com/archives/C01G6UJT2RM
-  slackChannel: "#hamradio"
-  status: ended
-  ended: '2024-05-31T23:59:59'
-  participants: 14
-- name: Trick or Trace
-  description: Design a PCB this October, vote on the best designs, get a second grant.
-  website: https://trickortrace.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07QMQ26X4G
-  slackChannel: "#trick-or-trace"
-  status: ended
-  ended: Ended October 21st
-- name: Anchor
-  description: Design a VTuber-style logo for your High Seas project and receive custom stickers.
-  website: https://anchor.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07V5401VMY
-  slackChannel: "#anchor"
-  status: ended
-  ended: '2025-01-27T23:59:59'
-  participants: 40
-- name: High Seas
-  description: Work on projects, earn doubloons, and compete in the Wonderdome.
-  website: https://highseas.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07PZMBUNDS
-  slackChannel: "#high-seas"
-  status: ended
-  deadline: '2025-01-31T23:59:59'
-  participants: 1119
-- name: Neon
-  description: Build code, get a 64x32 LED matrix.
-  website: https://neon.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C080GFRKXJ5
-  slackChannel: "#neon"
-  status: ended
-  deadline: '2025-01-31T23:59:59'
-  participants: 195
-- name: Say Cheese!
-  description: Fit a program in a QR code, get a portable printer and maybe a Blåhaj.
-  detailedDescription: Fit a program inside a QR code, and get a potentially cat-themed portable printer! The best project gets a Blåhaj.
-  website: https://saycheese.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C07QKKZPVD0
-  slackChannel: "#saycheese"
-  status: ended
-  deadline: '2025-01-26T23:59:59'
-  participants: 370
-- name: Cargo Cult
-  description: Build a Rust CLI and get a Rust book.
-  website:
-  slack: https://slack.com/archives/C0121LVV79P
-  slackChannel: "#rust"
-  status: ended
-  ended: '2024-12-31T23:59:59'
-- name: Winter Boba Drops
-  description: Create a winter-themed static website, get a boba plushie!
-  slack: https://hackclub.slack.com/archives/C06UJR8QW0M
-  slackChannel: "#boba"
-  status: ended
-  ended: '2024-12-31T23:59:59'
-- name: Optimize
-  description: Create a memory efficient desktop app, get RAM!
-  website: https://optimize.hackclub.com
-  slackChannel: "#optimize"
-  slack: https://hackclub.slack.com/archives/C096NH7FW4T
-  status: active
-  deadline: '2025-08-08T23:59:59'
-
-- name: birthday-cards
-  description: You ship a birthday themed project we ship a birthday card!
-  website: https://birthday-cards.hackclub.com/
-  slack: https://hackclub.slack.com/archives/C099VPF7V3P
-  slackChannel: "#birthday-cards-ysws"
-status: active
-deadline: 2026-08-12T23:59:59"
-detailedDescription: Join birthday-cards to create a birthday-themed project and receive a birthday card!
-details:
-   - you can get a gift from hq if you have 3 hours of work logged   
-
-
+ADVICE = """\
 DONT come up with your own advice, only use the advice mentioned.
 Advice on running a YSWS:
 always be polite, and try to reply to DMs 
 don't be sad rejecting fraudulent projects - remember fraud is banned
 don't handle fraud cases alone, dm the Fraud Department on Slack
+"""
 
+FORMAT_RULES = """\
 ALWAYS RETURN EVERYTHING IN HTML FORMAT! Don't write **, use <b> tags. Dont do []() for links, use <a> tags. Use <br> for new lines.
+"""
 
+HCB_NOTES = """\
 HCB (Hack Club Bank) (hcb.hackclub.com)
 Instructions:
 When applying to HCB for your YSWS, make sure to make the application under the name YSWS-<name>. So if you YSWS was named authly, you would name it YSWS-Authly. 
@@ -1166,25 +64,129 @@ you have to add allowed merchant ids for the virtual cards, so users can't fraud
 to get merchant ids, try to make a declined transcactions on the website of your reward, and after seeing that it gets declined the merchant id should be shown in the details. 
 then you can modify the HCB organization settings to add allowed ids
 For help, go to the slack channel #hcb on slack.
+"""
 
+CONTEXT_RULES = """\
+Only the YSWS programs, terms and notes relevant to the question are listed under "Relevant information". Answer from them.
+"""
 
+INTERNSHIP_NOTES = """\
 Hack Club Internship:
 This is how to get hack club internship: Build really cool things, contribute to Hack Club through open source or through running a great and actually good Hack Club / hackathon, be a kind and model member of the community, and staff will eventually start to loop you in on projects. Those projects may turn into internships. This is usually a 1-2 year process.
 """
 
-    prompt = f"{system_prompt}"
-    
+_prompt_lock = threading.Lock()
+# (catalog mtime, date, static prefix, prefix version, retrieval index)
+_prompt_state = (None, None, None, None, None)
 
+
+def load_catalog() -> str:
+    with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _catalog_mtime():
+    try:
+        return os.stat(CATALOG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _build_documents(catalog: str) -> list:
+    documents = split_catalog(catalog)
+    for line in TERMS.splitlines():
+        term = line.split(" - ", 1)[0]
+        documents.append({"kind": "term", "title": term, "text": line})
+    documents.append({"kind": "notes", "title": "HCB Hack Club Bank", "text": HCB_NOTES})
+    documents.append({"kind": "notes", "title": "Hack Club Internship", "text": INTERNSHIP_NOTES})
+    return documents
+
+
+def _build_static_prefix(documents: list) -> str:
+    active = dict.fromkeys(d["title"] for d in documents if d["kind"] == "program" and d["status"] == "active")
+    return "\n".join([
+        INTRO,
+        TERMS_INTRO,
+        ADVICE,
+        FORMAT_RULES,
+        CONTEXT_RULES,
+        "Currently active YSWS programs: " + ", ".join(active) + "\n",
+    ])
+
+
+def _current_state():
+    global _prompt_state
+    mtime = _catalog_mtime()
+    today = get_date().strftime("%A, %B %d, %Y")
+    state = _prompt_state
+    if state[0] == mtime and state[1] == today:
+        return state
+
+    with _prompt_lock:
+        state = _prompt_state
+        if state[0] == mtime and state[1] == today:
+            return state
+        if state[0] == mtime:
+            prefix, version, index = state[2], state[3], state[4]
+        else:
+            catalog = load_catalog()
+            documents = _build_documents(catalog)
+            index = BM25Index(documents)
+            prefix = _build_static_prefix(documents)
+            digest = hashlib.sha256(prefix.encode("utf-8"))
+            digest.update(catalog.encode("utf-8"))
+            version = digest.hexdigest()[:12]
+        _prompt_state = state = (mtime, today, prefix, version, index)
+        return state
+
+
+def build_system_prompt(question: str = "") -> str:
+    _, today, prefix, _, index = _current_state()
+
+    sections = {"program": [], "term": [], "notes": []}
+    for doc, score in index.search(question, RETRIEVAL_K):
+        sections[doc["kind"]].append(doc["text"].rstrip("\n"))
+
+    context = ["Relevant information:"]
+    if sections["program"]:
+        context.append("YSWS programs:\n---\n" + "\n".join(sections["program"]))
+    if sections["term"]:
+        context.append("Terms:\n" + "\n".join(sections["term"]))
+    context.extend(sections["notes"])
+
+    return f"{prefix}\n" + "\n\n".join(context) + f"\n\nThe current date is {today}!\n"
+
+
+def _answer_version() -> str:
+    # answers can depend on the date ("is X still open?"), so cached ones
+    # don't outlive the day they were generated on
+    state = _current_state()
+    return f"{state[3]}:{state[1]}"
+
+
+def build_payload(question: str, stream: bool = False) -> dict:
     payload = {
         "messages": [
-            {"role": "system", "content": prompt},
+            {"role": "system", "content": build_system_prompt(question)},
             {"role": "user", "content": question}
         ]
     }
-    
+    if stream:
+        payload["stream"] = True
+    return payload
+
+
+def ask_hackclub_ai(username: str, question: str, tune_file: str = "ai_tune.txt") -> str:
 
-    response = requests.post(
-        "https://ai.hackclub.com/chat/completions",
+    version = _answer_version()
+    cached = answer_cache.get(question, version)
+    if cached is not None:
+        return cached
+
+    payload = build_payload(question)
+
+    response = httpclient.post(
+        CHAT_URL,
         headers={"Content-Type": "application/json"},
         data=json.dumps(payload)
     )
@@ -1193,11 +195,112 @@ This is how to get hack club internship: Build really cool things, contribute to
     try:
         data = response.json()
         bot_reply = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-        return format_ai_response_generic(bot_reply)
+        answer = format_ai_response_generic(bot_reply)
+        if answer.strip():
+            answer_cache.set(question, version, answer)
+        return answer
     except Exception as e:
         return f"Error: {e}\nRaw response: {response.text}"
 
 
+def stream_hackclub_ai(username: str, question: str):
+    # yields the answer piece by piece as ai.hackclub.com generates it,
+    # with the model's <think> section already stripped out
+    version = _answer_version()
+    cached = answer_cache.get(question, version)
+    if cached is not None:
+        yield cached
+        return
+
+    payload = build_payload(question, stream=True)
+    think_filter = ThinkFilter()
+    parts = []
+
+    with httpclient.stream(
+        "POST",
+        CHAT_URL,
+        headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+        data=json.dumps(payload)
+    ) as response:
+        response.raise_for_status()
+        response.encoding = "utf-8"
+
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+
+            chunk = json.loads(data)
+            delta = chunk.get("choices", [{}])[0].get("delta", {}).get("content")
+            if delta:
+                text = think_filter.feed(delta)
+                if text:
+                    parts.append(text)
+                    yield text
+
+    text = think_filter.flush()
+    if text:
+        parts.append(text)
+        yield text
+
+    answer = "".join(parts)
+    if answer.strip():
+        answer_cache.set(question, version, answer)
+
+
+class ThinkFilter:
+    # Removes <think>...</think> from text that arrives in arbitrary chunks,
+    # so a tag split across two chunks is still caught.
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+
+    def __init__(self):
+        self.buffer = ""
+        self.thinking = False
+
+    def feed(self, text: str) -> str:
+        self.buffer += text
+        output = []
+
+        while self.buffer:
+            if self.thinking:
+                end = self.buffer.find(self.CLOSE)
+                if end == -1:
+                    # drop the thought but keep a possible partial closing tag
+                    self.buffer = self.buffer[-(len(self.CLOSE) - 1):]
+                    break
+                self.buffer = self.buffer[end + len(self.CLOSE):]
+                self.thinking = False
+            else:
+                start = self.buffer.find(self.OPEN)
+                if start == -1:
+                    keep = _partial_tag_length(self.buffer, self.OPEN)
+                    output.append(self.buffer[:len(self.buffer) - keep])
+                    self.buffer = self.buffer[len(self.buffer) - keep:]
+                    break
+                output.append(self.buffer[:start])
+                self.buffer = self.buffer[start + len(self.OPEN):]
+                self.thinking = True
+
+        return "".join(output)
+
+    def flush(self) -> str:
+        text = "" if self.thinking else self.buffer
+        self.buffer = ""
+        return text
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    # length of the longest suffix of text that is a prefix of tag
+    for size in range(min(len(text), len(tag) - 1), 0, -1):
+        if text.endswith(tag[:size]):
+            return size
+    return 0
+
+
 def format_ai_response_generic(raw_text: str) -> str: #doesnt work for now
 
     text = re.sub(r"<think>.*?</think>", "", raw_text, flags=re.DOTALL)
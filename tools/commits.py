@@ -1,29 +1,215 @@
-import requests
+import json
+import re
+from collections import Counter
+
+from utils import httpclient
+from utils.cache import TTLCache
+from tools.github import API_ROOT, GITHUB_TOKEN, GitHubError, api_headers, parse_repo_url
+
+GRAPHQL_URL = f"{API_ROOT}/graphql"
+PAGE_SIZE = 100
+# per-author counts for huge repos stop here and are flagged as partial
+MAX_PAGES = 20
+
+# keyed on (owner, repo, head sha): a repo whose HEAD hasn't moved keeps its
+# stats until it's evicted
+stats_cache = TTLCache(maxsize=1024, ttl=7 * 24 * 3600)
+
+LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>; rel="last"')
+
+# the default branch's HEAD and the first page of its history in one query,
+# so a repo whose HEAD hasn't moved costs a single round-trip
+HEAD_QUERY = """
+query($owner: String!, $repo: String!) {
+  repository(owner: $owner, name: $repo) {
+    defaultBranchRef {
+      target {
+        oid
+        ... on Commit {
+          history(first: 100) {
+            totalCount
+            pageInfo { hasNextPage endCursor }
+            nodes { committedDate author { name email user { login } } }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+HISTORY_QUERY = """
+query($owner: String!, $repo: String!, $oid: GitObjectID!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    object(oid: $oid) {
+      ... on Commit {
+        history(first: 100, after: $after) {
+          totalCount
+          pageInfo { hasNextPage endCursor }
+          nodes { committedDate author { name email user { login } } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# without a token every REST call counts against 60 an hour, so the plain
+# count (one call) is kept around for a few minutes
+count_cache = TTLCache(maxsize=1024, ttl=300)
+
 
 def get_commit_count(github_url):
+    owner, repo = parse_repo_url(github_url)
+    if GITHUB_TOKEN:
+        return _graphql_stats(owner, repo)['total']
+    return _rest_count(owner, repo)['total']
+
+
+def get_commit_stats(github_url, details=False):
+    # With a token: everything from GraphQL. Without one: the single-call
+    # count unless `details` asks for first commit and per-author counts too,
+    # which costs one or two more REST calls.
+    owner, repo = parse_repo_url(github_url)
+    if GITHUB_TOKEN:
+        return _graphql_stats(owner, repo)
+    summary = _rest_count(owner, repo)
+    if not details:
+        return summary
+    key = (owner.lower(), repo.lower(), summary['head_sha'])
+    return stats_cache.get_or_load(key, lambda: _fetch_rest(owner, repo, summary))
+
+
+def _summarize(head_sha, total, dates, authors, partial):
+    return {
+        'head_sha': head_sha,
+        'total': total,
+        'last_commit': max(dates) if dates else None,
+        'first_commit': min(dates) if dates else None,
+        'authors': [{'name': name, 'commits': count} for name, count in authors.most_common()],
+        'authors_partial': partial,
+        'details': True,
+    }
+
+
+def _author_name(author):
+    user = author.get('user') or {}
+    return user.get('login') or author.get('name') or author.get('email') or 'unknown'
+
+
+def _graphql(query, variables):
+    response = httpclient.post(
+        GRAPHQL_URL,
+        headers=api_headers(),
+        data=json.dumps({'query': query, 'variables': variables}),
+    )
+    if response.status_code != 200:
+        raise GitHubError(response.status_code, response.reason or "")
+    result = response.json()
+    if result.get('errors'):
+        raise GitHubError(response.status_code, result['errors'][0].get('message', ''))
+    return (result.get('data') or {}).get('repository') or {}
+
+
+def _graphql_history(owner, repo, head_sha, after):
+    repository = _graphql(HISTORY_QUERY, {'owner': owner, 'repo': repo, 'oid': head_sha, 'after': after})
+    history = (repository.get('object') or {}).get('history')
+    if history is None:
+        raise GitHubError(404, "repository or commit not found")
+    return history
+
+
+def _graphql_stats(owner, repo):
+    repository = _graphql(HEAD_QUERY, {'owner': owner, 'repo': repo})
+    target = (repository.get('defaultBranchRef') or {}).get('target')
+    if not target or target.get('history') is None:
+        raise GitHubError(404, "repository not found or empty")
+    head_sha = target['oid']
+    key = (owner.lower(), repo.lower(), head_sha)
+    return stats_cache.get_or_load(key, lambda: _fetch_graphql(owner, repo, head_sha, target['history']))
+
+
+def _fetch_graphql(owner, repo, head_sha, history):
+    # the whole history in 100-commit pages, the first one came with HEAD
+    dates = []
+    authors = Counter()
+
+    for page in range(MAX_PAGES):
+        for node in history['nodes']:
+            dates.append(node['committedDate'])
+            authors[_author_name(node.get('author') or {})] += 1
 
-    try:
-        parts = github_url.rstrip("/").split("/")
-        owner = parts[-2]
-        repo = parts[-1]
-    except IndexError:
-        return "ooooopsie you passed an invalid github link"
+        if not history['pageInfo']['hasNextPage']:
+            return _summarize(head_sha, history['totalCount'], dates, authors, False)
+        if page + 1 < MAX_PAGES:
+            history = _graphql_history(owner, repo, head_sha, history['pageInfo']['endCursor'])
 
+    # too big to page through: history cursors are "<sha> <offset>", so the
+    # oldest commit can still be fetched directly
+    total = history['totalCount']
+    oldest = _graphql_history(owner, repo, head_sha, f"{head_sha} {total - 2}")
+    dates.extend(node['committedDate'] for node in oldest['nodes'])
+    return _summarize(head_sha, total, dates, authors, True)
 
-    api_url = f"https://api.github.com/repos/{owner}/{repo}/commits?per_page=1"
-    
- 
-    response = requests.get(api_url)
+
+def _get_commits_page(owner, repo, params):
+    response = httpclient.get(f"{API_ROOT}/repos/{owner}/{repo}/commits", headers=api_headers(), params=params)
     if response.status_code != 200:
-        return f"Error: {response.status_code}"
+        raise GitHubError(response.status_code, response.reason or "")
+    return response
+
+
+def _rest_count(owner, repo):
+    return count_cache.get_or_load((owner.lower(), repo.lower()), lambda: _fetch_rest_count(owner, repo))
+
+
+def _fetch_rest_count(owner, repo):
+    # one commit per page, so the Link header's last page number is the
+    # commit count, and the one commit is HEAD
+    response = _get_commits_page(owner, repo, {'per_page': 1})
+    commits = response.json()
+    if not commits:
+        raise GitHubError(404, "repository is empty")
+    match = LAST_PAGE_RE.search(response.headers.get('Link', ''))
+    return {
+        'head_sha': commits[0]['sha'],
+        'total': int(match.group(1)) if match else len(commits),
+        'last_commit': commits[0]['commit']['committer']['date'],
+        'first_commit': None,
+        'authors': [],
+        'authors_partial': True,
+        'details': False,
+    }
+
+
+def _fetch_rest(owner, repo, summary):
+    head_sha, total = summary['head_sha'], summary['total']
+    last_page = max(1, -(-total // PAGE_SIZE))
+    oldest = _get_commits_page(owner, repo, {'sha': head_sha, 'per_page': PAGE_SIZE, 'page': last_page}).json()
+    dates = [c['commit']['committer']['date'] for c in oldest] + [summary['last_commit']]
+
+    if last_page == 1:
+        # that one page is the whole history
+        authors = Counter(_author_name(_rest_author(c)) for c in oldest)
+        return _summarize(head_sha, total, dates, authors, False)
 
-    if 'Link' in response.headers:
-        link = response.headers['Link']
-        import re
-        match = re.search(r'&page=(\d+)>; rel="last"', link)
-        if match:
-            return int(match.group(1))
+    # contributor totals cover the default branch, good enough for a review
+    response = httpclient.get(
+        f"{API_ROOT}/repos/{owner}/{repo}/contributors",
+        headers=api_headers(),
+        params={'anon': 1, 'per_page': PAGE_SIZE},
+    )
+    authors = Counter()
+    partial = True
+    if response.status_code == 200:
+        for contributor in response.json():
+            authors[contributor.get('login') or contributor.get('name') or contributor.get('email') or 'unknown'] += contributor.get('contributions', 0)
+        partial = 'rel="next"' in response.headers.get('Link', '')
 
-    return len(response.json())
+    return _summarize(head_sha, total, dates, authors, partial)
 
 
+def _rest_author(commit):
+    author = commit['commit'].get('author') or {}
+    login = (commit.get('author') or {}).get('login')
+    return {'name': author.get('name'), 'email': author.get('email'), 'user': {'login': login} if login else None}
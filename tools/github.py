@@ -0,0 +1,69 @@
+import os
+import re
+from urllib.parse import urlparse
+
+from utils import httpclient
+from utils.cache import TTLCache
+
+API_ROOT = "https://api.github.com"
+RAW_ROOT = "https://raw.githubusercontent.com"
+
+NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# optional, raises the API rate limit from 60 to 5000 requests an hour
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+
+# ETag + body of every successful GET, so a repeat lookup can be revalidated
+# with If-None-Match. GitHub answers 304 for unchanged resources, which
+# saves the transfer. With GITHUB_TOKEN set a 304 also doesn't count against
+# the rate limit, without a token it still does.
+etag_cache = TTLCache(maxsize=2048, ttl=24 * 3600)
+
+
+class GitHubError(Exception):
+    def __init__(self, status_code, message=""):
+        super().__init__(f"GitHub error: {status_code} {message}".strip())
+        self.status_code = status_code
+
+
+def parse_repo_url(repo_url):
+    parts = urlparse(repo_url.strip()).path.strip("/").split("/")
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        raise ValueError("Invalid GitHub repo URL")
+    owner, repo = parts[0], parts[1]
+    if repo.endswith(".git"):
+        repo = repo[:-4]
+    # both end up in API URLs and in the repo-analysis clone path
+    for name in (owner, repo):
+        if not NAME_RE.match(name) or name in (".", ".."):
+            raise ValueError("Invalid GitHub repo URL")
+    return owner, repo
+
+
+def api_headers(accept="application/vnd.github+json"):
+    headers = {"Accept": accept}
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    return headers
+
+
+def conditional_get(url, accept="application/vnd.github+json"):
+    # GET that revalidates against the local ETag cache, returns the body text
+    headers = api_headers(accept) if url.startswith(API_ROOT) else {"Accept": accept}
+    key = (url, accept)
+    cached = etag_cache.get(key)
+    if cached is not None:
+        headers["If-None-Match"] = cached["etag"]
+
+    response = httpclient.get(url, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return cached["body"]
+    if response.status_code != 200:
+        raise GitHubError(response.status_code, response.reason or "")
+
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    etag = response.headers.get("ETag")
+    if etag:
+        etag_cache.set(key, {"etag": etag, "body": response.text})
+    return response.text
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from utils import httpclient
+from utils.cache import TTLCache
+
+STATS_URL = "https://hackatime.hackclub.com/api/v1/users/{user_id}/stats"
+
+# a reviewer usually checks the same user across several tools in a row,
+# so keep stats payloads around for a few minutes
+stats_cache = TTLCache(maxsize=512, ttl=300)
+
+# every tool asks for the same features, so they all share one cache entry
+# (and one in-flight request) per user
+STATS_FEATURES = 'projects,languages'
+
+RESOLVE_WORKERS = 8
+
+
+class HackatimeError(Exception):
+    def __init__(self, status_code, text):
+        super().__init__(f"HackaTime API error: {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+
+def get_user_stats(user_id, features=None, project=None):
+    key = (user_id, features, project)
+    return stats_cache.get_or_load(key, lambda: _fetch_user_stats(user_id, features, project))
+
+
+def _fetch_user_stats(user_id, features, project):
+    params = {}
+    if features:
+        params['features'] = features
+    if project:
+        params['filter_by_project'] = project
+
+    response = httpclient.get(STATS_URL.format(user_id=user_id), params=params)
+    if response.status_code != 200:
+        raise HackatimeError(response.status_code, response.text)
+    return response.json()
+
+
+def get_project_seconds(user_id):
+    # {project name: seconds} for one user, from the cached stats call
+    stats = get_user_stats(user_id, features=STATS_FEATURES)
+    return {p.get('name'): p.get('total_seconds', 0) for p in stats.get('data', {}).get('projects', [])}
+
+
+def resolve_hours(items, max_workers=RESOLVE_WORKERS):
+    # (slack_id, project) pairs to hours: one stats call per distinct user,
+    # fetched concurrently, instead of three chained calls per pair
+    user_ids = list(dict.fromkeys(item['slack_id'] for item in items if item['slack_id']))
+    projects = {}
+    errors = {}
+    if user_ids:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(user_ids))) as pool:
+            futures = {pool.submit(get_project_seconds, user_id): user_id for user_id in user_ids}
+            for future in as_completed(futures):
+                user_id = futures[future]
+                try:
+                    projects[user_id] = future.result()
+                except HackatimeError as e:
+                    errors[user_id] = f"HackaTime API error: {e.status_code}"
+                except requests.RequestException as e:
+                    errors[user_id] = f"HackaTime request failed: {e}"
+
+    results = []
+    for item in items:
+        result = {'slack_id': item['slack_id'], 'project': item['project'], 'hours': None, 'error': None}
+        if not item['slack_id'] or not item['project']:
+            result['error'] = 'missing slack id or project'
+        elif item['slack_id'] in errors:
+            result['error'] = errors[item['slack_id']]
+        elif item['project'] not in projects[item['slack_id']]:
+            result['error'] = 'project not found'
+        else:
+            result['hours'] = round(projects[item['slack_id']][item['project']] / 3600, 4)
+        results.append(result)
+    return results
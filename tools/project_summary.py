@@ -0,0 +1,40 @@
+from tools.hackatime import get_user_stats, STATS_FEATURES
+
+
+def _breakdown(entries, total_seconds):
+    rows = []
+    for entry in sorted(entries, key=lambda e: e.get('total_seconds', 0), reverse=True):
+        seconds = entry.get('total_seconds', 0)
+        rows.append({
+            'rank': len(rows) + 1,
+            'name': entry.get('name'),
+            'hours': round(seconds / 3600, 2),
+            'text': entry.get('text'),
+            'percent': round(seconds / total_seconds * 100, 1) if total_seconds else 0.0,
+        })
+    return rows
+
+
+def build_project_summary(user_id):
+    # everything the summary page shows, from the same cached stats call the
+    # other hackatime tools use
+    stats = get_user_stats(user_id, features=STATS_FEATURES)
+    data = stats.get('data', {})
+    trust = stats.get('trust_factor') or {}
+
+    projects = data.get('projects') or []
+    total_seconds = data.get('total_seconds') or sum(p.get('total_seconds', 0) for p in projects)
+
+    return {
+        'user_id': user_id,
+        'username': data.get('username'),
+        'total_hours': round(total_seconds / 3600, 2),
+        'human_readable_total': data.get('human_readable_total'),
+        'trust': {
+            'level': trust.get('trust_level'),
+            'value': trust.get('trust_value'),
+            'trusted': trust.get('trust_value') == 1,
+        },
+        'projects': _breakdown(projects, total_seconds),
+        'languages': _breakdown(data.get('languages') or [], total_seconds),
+    }
@@ -0,0 +1,188 @@
+import os
+import subprocess
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.cache import TTLCache
+from utils.filelock import file_lock
+
+# how much history a clone keeps, big repos are analysed on their newest commits
+CLONE_DEPTH = 2000
+GIT_TIMEOUT = 300
+
+# commits less than BURST_WINDOW seconds apart are part of the same burst,
+# and a burst needs at least BURST_MIN commits to be reported
+BURST_WINDOW = 120
+BURST_MIN = 3
+LARGE_COMMIT_LINES = 1000
+
+LOG_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%aI%x1f%ct"
+
+analysis_cache = TTLCache(maxsize=256, ttl=24 * 3600)
+
+_repo_locks = {}
+_repo_locks_lock = threading.Lock()
+
+
+class GitError(Exception):
+    pass
+
+
+def _git(args, cwd=None, timeout=GIT_TIMEOUT):
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    try:
+        result = subprocess.run(
+            ["git"] + args, cwd=cwd, env=env, timeout=timeout,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+    except subprocess.TimeoutExpired:
+        raise GitError(f"git {args[0]} timed out after {timeout}s")
+    except OSError as e:
+        raise GitError(f"could not run git: {e}")
+    if result.returncode != 0:
+        raise GitError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+@contextmanager
+def _repo_lock(path):
+    # the thread lock keeps requests in this worker waiting their turn, the
+    # file lock keeps the other workers out of the same clone
+    with _repo_locks_lock:
+        lock = _repo_locks.setdefault(path, threading.Lock())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with lock, file_lock(path):
+        yield
+
+
+def clone_path(cache_dir, owner, repo):
+    # owner and repo come from a user-supplied URL, the clone must not land
+    # outside the cache directory whatever they contain
+    root = os.path.realpath(cache_dir)
+    path = os.path.realpath(os.path.join(root, owner.lower(), f"{repo.lower()}.git"))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError("Invalid GitHub repo URL")
+    return path
+
+
+def sync_repo(source, path, depth=CLONE_DEPTH):
+    # first call makes a shallow bare clone, later calls only fetch what's new
+    with _repo_lock(path):
+        if not os.path.isdir(path):
+            _git(["clone", "--bare", "--quiet", "--no-tags", f"--depth={depth}", source, path])
+        else:
+            # the remote's HEAD goes straight into the local default branch
+            branch = _git(["symbolic-ref", "HEAD"], cwd=path).strip()
+            _git(["fetch", "--quiet", "--no-tags", "--update-head-ok", f"--depth={depth}",
+                  "origin", f"+HEAD:{branch}"], cwd=path)
+        return _git(["rev-parse", "HEAD"], cwd=path).strip()
+
+
+def analyze_repo(source, path, depth=CLONE_DEPTH):
+    head_sha = sync_repo(source, path, depth)
+    key = (path, head_sha)
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with _repo_lock(path):
+        log = _git(["log", f"--format={LOG_FORMAT}", "--numstat", "HEAD"], cwd=path)
+        shallow = _git(["rev-parse", "--is-shallow-repository"], cwd=path).strip() == "true"
+
+    result = summarize_commits(parse_log(log))
+    result['head_sha'] = head_sha
+    result['shallow'] = shallow
+    analysis_cache.set(key, result)
+    return result
+
+
+def parse_log(log):
+    commits = []
+    for record in log.split("\x1e"):
+        if not record.strip():
+            continue
+        header, _, numstat = record.partition("\n")
+        sha, name, email, authored, committed = header.split("\x1f")
+        added = deleted = files = 0
+        for line in numstat.splitlines():
+            parts = line.split("\t")
+            if len(parts) != 3:
+                continue
+            # binary files show up as "-\t-\tpath"
+            added += int(parts[0]) if parts[0].isdigit() else 0
+            deleted += int(parts[1]) if parts[1].isdigit() else 0
+            files += 1
+        commits.append({
+            'sha': sha,
+            'author': name or email,
+            'authored_at': datetime.fromisoformat(authored),
+            'committed_at': int(committed),
+            'added': added,
+            'deleted': deleted,
+            'files': files,
+        })
+    return commits
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize_commits(commits):
+    # commits come newest first from git log
+    hours = [0] * 24
+    weekdays = [0] * 7
+    authors = Counter()
+    lines = []
+    for commit in commits:
+        # the author's own clock, a 4am commit streak is worth a look
+        hours[commit['authored_at'].hour] += 1
+        weekdays[commit['authored_at'].weekday()] += 1
+        authors[commit['author']] += 1
+        lines.append(commit['added'] + commit['deleted'])
+
+    bursts = []
+    ordered = sorted(commits, key=lambda c: c['committed_at'])
+    run = ordered[:1]
+    for previous, commit in zip(ordered, ordered[1:]):
+        if commit['committed_at'] - previous['committed_at'] <= BURST_WINDOW:
+            run.append(commit)
+            continue
+        if len(run) >= BURST_MIN:
+            bursts.append(run)
+        run = [commit]
+    if len(run) >= BURST_MIN:
+        bursts.append(run)
+
+    return {
+        'total_commits': len(commits),
+        'first_commit': ordered[0]['authored_at'].isoformat() if ordered else None,
+        'last_commit': ordered[-1]['authored_at'].isoformat() if ordered else None,
+        'active_days': len({c['authored_at'].date() for c in commits}),
+        'lines_added': sum(c['added'] for c in commits),
+        'lines_deleted': sum(c['deleted'] for c in commits),
+        'lines_per_commit': {
+            'median': _percentile(lines, 0.5),
+            'p90': _percentile(lines, 0.9),
+            'max': max(lines) if lines else 0,
+        },
+        'large_commits': [
+            {'sha': c['sha'][:10], 'lines': c['added'] + c['deleted'], 'files': c['files'],
+             'authored_at': c['authored_at'].isoformat()}
+            for c in commits if c['added'] + c['deleted'] >= LARGE_COMMIT_LINES
+        ],
+        'bursts': [
+            {'commits': len(run), 'start': run[0]['authored_at'].isoformat(),
+             'seconds': run[-1]['committed_at'] - run[0]['committed_at'],
+             'lines': sum(c['added'] + c['deleted'] for c in run)}
+            for run in bursts
+        ],
+        'hour_histogram': hours,
+        'weekday_histogram': weekdays,
+        'authors': [{'name': name, 'commits': count} for name, count in authors.most_common()],
+    }
@@ -0,0 +1,84 @@
+import math
+import re
+from collections import Counter
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "get", "how", "i", "in", "is", "it", "me", "my", "of", "on", "or",
+    "s", "so", "that", "the", "this", "to", "was", "what", "when", "where", "which",
+    "who", "why", "will", "with", "you", "your", "ysws",
+}
+
+
+def tokenize(text):
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    # Small in-memory BM25 index. Documents are dicts with at least a "text"
+    # key; "title" tokens are counted a few extra times so asking about a
+    # program by name reliably finds its entry.
+
+    def __init__(self, documents, k1=1.5, b=0.75, title_boost=3):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.lengths = []
+
+        for doc_id, doc in enumerate(documents):
+            tokens = tokenize(doc["text"]) + tokenize(doc.get("title", "")) * title_boost
+            self.lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                self.postings.setdefault(term, []).append((doc_id, count))
+
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query, k=5):
+        scores = Counter()
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, count in self.postings[term]:
+                norm = 1 - self.b + self.b * self.lengths[doc_id] / self.avg_length
+                scores[doc_id] += idf * count * (self.k1 + 1) / (count + self.k1 * norm)
+        return [(self.documents[doc_id], score) for doc_id, score in scores.most_common(k)]
+
+
+def split_catalog(catalog_text):
+    # Splits the catalog YAML into one chunk per program without needing a
+    # YAML parser: programs are the "- name:" items under each top-level list.
+    entries = []
+    section = None
+    current = None
+
+    for line in catalog_text.splitlines():
+        if re.match(r"^[A-Za-z]\w*:\s*$", line):
+            section = line.rstrip(":").strip()
+            current = None
+            continue
+        match = re.match(r"^- name:\s*(.*)$", line)
+        if match:
+            current = {"title": match.group(1).strip().strip("'\""), "section": section, "lines": [line]}
+            entries.append(current)
+        elif current is not None and line.strip():
+            current["lines"].append(line)
+
+    documents = []
+    for entry in entries:
+        text = "\n".join(entry["lines"])
+        status = re.search(r"^\s+status:\s*(\S+)", text, re.MULTILINE)
+        documents.append({
+            "kind": "program",
+            "title": entry["title"],
+            "section": entry["section"],
+            "status": status.group(1) if status else None,
+            "text": text,
+        })
+    return documents
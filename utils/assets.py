@@ -0,0 +1,229 @@
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import sys
+import zipfile
+
+from flask import abort, request, send_file, url_for
+from markupsafe import Markup
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DIST = 'dist'
+MANIFEST = 'manifest.json'
+COMPRESS = {'.css', '.js', '.svg', '.json', '.txt', '.ttf'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# third-party files that are self-hosted: fetched from the upstream release
+# archive into static/ by build() when missing, then fingerprinted like the
+# rest. Until a fetch succeeds the pages keep the CDN links.
+FA_ROOT = 'fontawesome-free-6.5.0-web/'
+VENDOR = (
+    ('https://github.com/tonsky/FiraCode/releases/download/6.2/Fira_Code_v6.2.zip', {
+        'woff2/FiraCode-Regular.woff2': 'fonts/FiraCode-Regular.woff2',
+        'woff2/FiraCode-Bold.woff2': 'fonts/FiraCode-Bold.woff2',
+    }),
+    ('https://github.com/FortAwesome/Font-Awesome/releases/download/6.5.0/fontawesome-free-6.5.0-web.zip', dict(
+        [(FA_ROOT + 'css/all.min.css', 'vendor/fontawesome/css/all.min.css')] +
+        [(FA_ROOT + 'webfonts/' + name + ext, 'vendor/fontawesome/webfonts/' + name + ext)
+         for name in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility')
+         for ext in ('.woff2', '.ttf')]
+    )),
+)
+VENDOR_TIMEOUT = 15
+
+FONT_FILE = 'fonts/FiraCode-Regular.woff2'
+FONT_CSS = 'css/fonts.css'
+GOOGLE_FONTS = '<link href="https://fonts.googleapis.com/css2?family=Fira+Code&display=swap" rel="stylesheet">'
+ICONS_CSS = 'vendor/fontawesome/css/all.min.css'
+ICONS_CDN = '<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/css/all.min.css">'
+
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def _hashed_name(rel, content):
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    root, ext = posixpath.splitext(rel)
+    return '%s.%s%s' % (root, digest, ext)
+
+
+def _write(path, content):
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def fetch_vendor(static_dir):
+    # returns the archives that couldn't be fetched, a failed download
+    # leaves the CDN fallback in place instead of stopping the start
+    import requests
+    failed = []
+    for url, files in VENDOR:
+        missing = {src: dest for src, dest in files.items()
+                   if not os.path.exists(os.path.join(static_dir, dest))}
+        if not missing:
+            continue
+        try:
+            response = requests.get(url, timeout=VENDOR_TIMEOUT)
+            response.raise_for_status()
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                for src, dest in missing.items():
+                    _write(os.path.join(static_dir, dest), archive.read(src))
+        except (requests.RequestException, zipfile.BadZipFile, KeyError) as e:
+            failed.append((url, e))
+    return failed
+
+
+class Assets:
+    # Fingerprinted copies of everything under static/ in static/dist/,
+    # e.g. css/index.css -> dist/css/index.3f2a9c01de.css, next to .gz (and
+    # .br with the brotli package) variants of the text files. Since a
+    # changed file gets a new name, the copies are served with an immutable
+    # one year Cache-Control and a browser never asks for them again.
+    #
+    # The files of the previous build are kept, so pages rendered by a
+    # worker that hasn't restarted yet still find their assets.
+
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self.dist_dir = os.path.join(static_dir, DIST)
+        self.manifest = {}
+
+    def _sources(self):
+        for root, dirs, files in os.walk(self.static_dir):
+            if os.path.abspath(root) == os.path.abspath(self.static_dir):
+                dirs[:] = [d for d in dirs if d != DIST]
+            for name in files:
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, self.static_dir).replace(os.sep, '/'), path
+
+    def _rewrite_css(self, rel, content, manifest):
+        # url(../fonts/x.woff2) inside a stylesheet has to point at the
+        # fingerprinted file as well
+        base = posixpath.dirname(rel)
+
+        def replace(match):
+            quote, ref = match.groups()
+            if ref.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+                return match.group(0)
+            path, suffix = re.match(r'([^?#]*)(.*)', ref).groups()
+            target = posixpath.normpath(posixpath.join(base, path))
+            if target not in manifest:
+                return match.group(0)
+            new = posixpath.relpath(manifest[target], base or '.')
+            return 'url(%s%s%s%s)' % (quote, new, suffix, quote)
+
+        return CSS_URL.sub(replace, content.decode('utf-8')).encode('utf-8')
+
+    def build(self, fetch=True):
+        if fetch:
+            for url, error in fetch_vendor(self.static_dir):
+                print(f"Assets: could not fetch {url}: {error}")
+        previous = self._read_manifest()
+        manifest = {}
+        # stylesheets last, they refer to the fonts and images
+        sources = sorted(self._sources(), key=lambda item: (item[0].endswith('.css'), item[0]))
+        for rel, path in sources:
+            with open(path, 'rb') as f:
+                content = f.read()
+            if rel.endswith('.css'):
+                content = self._rewrite_css(rel, content, manifest)
+            hashed = _hashed_name(rel, content)
+            manifest[rel] = hashed
+
+            target = os.path.join(self.dist_dir, hashed)
+            _write(target, content)
+            if posixpath.splitext(rel)[1] in COMPRESS:
+                _write(target + '.gz', gzip.compress(content, 9, mtime=0))
+                if brotli is not None:
+                    _write(target + '.br', brotli.compress(content, quality=11))
+
+        os.makedirs(self.dist_dir, exist_ok=True)
+        tmp = os.path.join(self.dist_dir, MANIFEST + '.%d.tmp' % os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, os.path.join(self.dist_dir, MANIFEST))
+
+        self._prune(set(manifest.values()) | set(previous.values()))
+        self.manifest = manifest
+        return manifest
+
+    def _prune(self, keep):
+        for root, dirs, files in os.walk(self.dist_dir):
+            for name in files:
+                rel = os.path.relpath(os.path.join(root, name), self.dist_dir).replace(os.sep, '/')
+                original = re.sub(r'\.(gz|br)$', '', rel)
+                if rel != MANIFEST and original not in keep and not name.endswith('.tmp'):
+                    os.remove(os.path.join(root, name))
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.dist_dir, MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self):
+        self.manifest = self._read_manifest()
+
+    def url(self, path):
+        # url_for('static', ...) that knows about the fingerprinted copies,
+        # falls back to the plain file when there's no build (--dev)
+        hashed = self.manifest.get(path)
+        if hashed is None:
+            return url_for('static', filename=path)
+        return url_for('dist_asset', filename=hashed)
+
+    def font_links(self):
+        if not os.path.exists(os.path.join(self.static_dir, FONT_FILE)):
+            return Markup(GOOGLE_FONTS)
+        return Markup(
+            '<link rel="preload" href="%s" as="font" type="font/woff2" crossorigin>\n'
+            '  <link rel="stylesheet" href="%s">'
+        ) % (self.url(FONT_FILE), self.url(FONT_CSS))
+
+    def icon_links(self):
+        if not os.path.exists(os.path.join(self.static_dir, ICONS_CSS)):
+            return Markup(ICONS_CDN)
+        return Markup('<link rel="stylesheet" href="%s">') % self.url(ICONS_CSS)
+
+    def serve(self, filename):
+        path = safe_join(self.dist_dir, filename)
+        if path is None or filename == MANIFEST or not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        encoding = None
+        if posixpath.splitext(filename)[1] in COMPRESS:
+            for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+                if request.accept_encodings[name] and os.path.isfile(path + suffix):
+                    encoding, path = name, path + suffix
+                    break
+
+        response = send_file(path, mimetype=mimetype, conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+
+if __name__ == '__main__':
+    # `python -m utils.assets` fetches the vendor files and builds static/dist/,
+    # the same as a start outside of --dev does
+    static_dir = sys.argv[1] if len(sys.argv) > 1 else 'static'
+    for rel, hashed in sorted(Assets(static_dir).build().items()):
+        print('%s -> %s' % (rel, hashed))
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.filelock import file_lock
+
+
+class RecordStore:
+    # A JSON list of records (admin keys, users) held in memory and indexed by
+    # one field. The file is only re-read when its mtime changes, and every
+    # mutation is written straight back with an atomic rename. Mutations hold
+    # a file lock and start from the file's current contents, so several
+    # worker processes can share one store without losing each other's writes.
+
+    def __init__(self, path, key_field, check_interval=1.0):
+        self.path = path
+        self.key_field = key_field
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._records = []
+        self._index = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._reload()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _reload(self):
+        try:
+            with open(self.path, 'r') as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            records = []
+        self._mtime = self._file_mtime()
+        self._set(records)
+
+    def _set(self, records):
+        self._records = records
+        self._index = {r[self.key_field]: r for r in records if self.key_field in r}
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        if self._file_mtime() != self._mtime:
+            self._reload()
+
+    @contextmanager
+    def _mutating(self):
+        with self._lock, file_lock(self.path):
+            self._refresh(force=True)
+            yield
+
+    def _write(self, records):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(records, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._mtime = self._file_mtime()
+        self._set(records)
+
+    def get(self, value):
+        with self._lock:
+            self._refresh()
+            record = self._index.get(value)
+            return dict(record) if record else None
+
+    def all(self):
+        with self._lock:
+            self._refresh()
+            return [dict(r) for r in self._records]
+
+    def replace(self, records):
+        with self._mutating():
+            self._write([dict(r) for r in records])
+
+    def add(self, record):
+        with self._mutating():
+            self._write(self._records + [dict(record)])
+
+    def remove(self, value):
+        with self._mutating():
+            records = [r for r in self._records if r.get(self.key_field) != value]
+            if len(records) == len(self._records):
+                return False
+            self._write(records)
+            return True
+
+    def update(self, value, **changes):
+        with self._mutating():
+            if value not in self._index:
+                return False
+            records = [
+                dict(r, **changes) if r.get(self.key_field) == value else r
+                for r in self._records
+            ]
+            self._write(records)
+            return True
@@ -0,0 +1,68 @@
+import json
+import threading
+import time
+
+from utils.sqlstore import Database
+
+
+class DiskCache:
+    # Small persistent key/value cache in a SQLite file. Values are stored as
+    # JSON and the least recently used rows are dropped past `maxsize`, so it
+    # survives restarts without growing forever.
+
+    def __init__(self, path, maxsize=5000):
+        self.db = Database(path)
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)")
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None):
+        rows = self.db.query("SELECT value FROM cache WHERE key = ?", (key,))
+        if not rows:
+            self._count(False)
+            return default
+        self.db.execute("UPDATE cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._count(True)
+        return json.loads(rows[0]['value'])
+
+    def set(self, key, value):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            (size,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            if size > self.maxsize:
+                conn.execute(
+                    "DELETE FROM cache WHERE key IN"
+                    " (SELECT key FROM cache ORDER BY last_used LIMIT ?)",
+                    (size - self.maxsize,),
+                )
+
+    def stats(self):
+        size = self.db.query("SELECT COUNT(*) AS n FROM cache")[0]['n']
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'size': size,
+            'maxsize': self.maxsize,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+        }
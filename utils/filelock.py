@@ -0,0 +1,51 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+def _lock(fd, shared):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        # Windows has no shared locks here, and LK_LOCK gives up after about
+        # ten seconds, so keep trying
+        while True:
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    # Advisory lock on a "<path>.lock" sidecar, shared between every worker
+    # process on the machine. The data file itself is replaced by rename on
+    # writes, so it can't carry the lock. Without flock or msvcrt it's a
+    # no-op, which is fine for the single-process dev server.
+    fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock(fd, shared)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlparse
+
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import registry
+
+# One shared session for every outbound call, so repeated Hackatime / GitHub /
+# ai.hackclub.com lookups reuse warm keep-alive connections instead of doing a
+# fresh TCP + TLS handshake each time.
+
+CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 30))
+
+RETRIES = int(os.environ.get('HTTP_RETRIES', 3))
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = ('GET', 'HEAD')
+# a longer Retry-After is returned to the caller instead of waited out
+MAX_RETRY_AFTER = float(os.environ.get('HTTP_MAX_RETRY_AFTER', 10))
+
+POOL_HOSTS = 10
+MAX_PER_HOST = int(os.environ.get('HTTP_MAX_PER_HOST', 8))
+
+# per-host overrides, the LLM endpoint is slow and shouldn't be hammered
+HOST_TIMEOUTS = {
+    'ai.hackclub.com': (CONNECT_TIMEOUT, 120),
+}
+HOST_LIMITS = {
+    'ai.hackclub.com': int(os.environ.get('HTTP_AI_MAX_CONCURRENCY', 4)),
+}
+
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+
+
+def _build_session():
+    # retries happen in request(), between attempts, so a backoff or a
+    # Retry-After wait never holds one of the host's slots
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=MAX_PER_HOST)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _host_semaphore(host):
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        with _session_lock:
+            semaphore = _host_semaphores.setdefault(
+                host, threading.BoundedSemaphore(HOST_LIMITS.get(host, MAX_PER_HOST))
+            )
+    return semaphore
+
+
+def _is_error(status_code):
+    return status_code >= 500 or status_code == 429
+
+
+def _body_size(kwargs, response=None):
+    # the prepared body when there is a response, otherwise encoded the way
+    # requests would have sent it
+    if response is not None and response.request is not None:
+        body = response.request.body
+    elif kwargs.get('json') is not None:
+        body = json.dumps(kwargs['json'], allow_nan=False)
+    else:
+        body = kwargs.get('data')
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, dict):
+        return len(urlencode(body, doseq=True))
+    return 0
+
+
+def _retry_delay(response, attempt):
+    # exponential backoff, or the server's Retry-After if it asks for longer;
+    # None when it asks for more than MAX_RETRY_AFTER
+    delay = BACKOFF_FACTOR * (2 ** attempt)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            wait = float(retry_after)
+        except ValueError:
+            try:
+                wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                wait = 0
+        if wait > MAX_RETRY_AFTER:
+            return None
+        delay = max(delay, wait)
+    return delay
+
+
+def _attempt(method, url, host, kwargs):
+    with _host_semaphore(host):
+        # timed once the host slot is taken, so it measures the upstream and
+        # not our own queueing
+        started = time.perf_counter()
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except requests.RequestException:
+            registry.observe('upstream', host, time.perf_counter() - started, error=True,
+                             bytes_out=_body_size(kwargs))
+            raise
+        registry.observe('upstream', host, time.perf_counter() - started, error=_is_error(response.status_code),
+                         bytes_in=len(response.content), bytes_out=_body_size(kwargs, response))
+        return response
+
+
+def request(method, url, **kwargs):
+    host = urlparse(url).hostname
+    kwargs.setdefault('timeout', HOST_TIMEOUTS.get(host, (CONNECT_TIMEOUT, READ_TIMEOUT)))
+    retry = method.upper() in RETRY_METHODS
+    for attempt in range(RETRIES + 1):
+        last = not retry or attempt == RETRIES
+        try:
+            response = _attempt(method, url, host, kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last:
+                raise
+            time.sleep(_retry_delay(None, attempt))
+            continue
+        if last or response.status_code not in RETRY_STATUSES:
+            return response
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            return response
+        time.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+@contextmanager
+def stream(method, url, **kwargs):
+    # the host slot and the pooled connection are held until the body is consumed
+    host = urlparse(url).hostname
+    kwargs.setdefault('timeout', HOST_TIMEOUTS.get(host, (CONNECT_TIMEOUT, READ_TIMEOUT)))
+    with _host_semaphore(host):
+        started = time.perf_counter()
+        try:
+            response = get_session().request(method, url, stream=True, **kwargs)
+        except requests.RequestException:
+            registry.observe('upstream', host, time.perf_counter() - started, error=True,
+                             bytes_out=_body_size(kwargs))
+            raise
+        # SSE and chunked bodies have no Content-Length, count the chunks as
+        # the caller reads them (iter_lines and .content go through here too)
+        received = [0]
+        iter_content = response.iter_content
+
+        def counted(*args, **kw):
+            for chunk in iter_content(*args, **kw):
+                received[0] += len(chunk)
+                yield chunk
+
+        response.iter_content = counted
+        try:
+            yield response
+        finally:
+            response.close()
+            registry.observe('upstream', host, time.perf_counter() - started, error=_is_error(response.status_code),
+                             bytes_in=received[0], bytes_out=_body_size(kwargs, response))
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import threading
+
+from flask import abort, send_file, url_for
+from markupsafe import Markup
+from werkzeug.security import safe_join
+
+from utils.assets import IMMUTABLE
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+# the only widths that get generated, the browser picks from the srcset
+WIDTHS = (64, 128, 256, 512)
+FORMATS = (('avif', 'image/avif', 50), ('webp', 'image/webp', 80))
+SOURCES = ('.jpg', '.jpeg', '.png')
+
+
+def _supported(fmt):
+    if Image is None:
+        return False
+    try:
+        return features.check(fmt)
+    except ValueError:
+        return False
+
+
+class ImageVariants:
+    # Resized AVIF/WebP copies of the images in static/, generated on first
+    # request (or up front by build()) and kept in `cache_dir`. The URLs
+    # carry a version taken from the source file, so they're served as
+    # immutable like the other assets. Without Pillow the templates just
+    # get the original image.
+
+    def __init__(self, static_dir, cache_dir, asset_url):
+        self.static_dir = static_dir
+        self.cache_dir = cache_dir
+        self.asset_url = asset_url
+        self.formats = [f for f in FORMATS if _supported(f[0])]
+        self._lock = threading.Lock()
+
+    def _source(self, path):
+        source = safe_join(self.static_dir, path)
+        if source is None or not path.lower().endswith(SOURCES) or not os.path.isfile(source):
+            return None
+        return source
+
+    def _version(self, source):
+        stat = os.stat(source)
+        return hashlib.sha1(('%d:%d' % (stat.st_mtime_ns, stat.st_size)).encode()).hexdigest()[:10]
+
+    def _cache_path(self, path, version, width, fmt):
+        root = os.path.splitext(path)[0].replace('/', os.sep)
+        return os.path.join(self.cache_dir, '%s.%s.%d.%s' % (root, version, width, fmt))
+
+    def _generate(self, source, target, width, fmt, quality):
+        with self._lock:
+            if os.path.exists(target):
+                return
+            with Image.open(source) as original:
+                # JPEGs can be decoded at a fraction of their size directly
+                original.draft(original.mode, (width, width))
+                image = ImageOps.exif_transpose(original)
+                if image.width > width:
+                    image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                tmp = '%s.%d.tmp' % (target, os.getpid())
+                image.save(tmp, fmt.upper(), quality=quality)
+                os.replace(tmp, target)
+
+    def variant(self, path, width, fmt):
+        quality = dict((f[0], f[2]) for f in self.formats).get(fmt)
+        source = self._source(path)
+        if quality is None or width not in WIDTHS or source is None:
+            return None
+        target = self._cache_path(path, self._version(source), width, fmt)
+        if not os.path.exists(target):
+            self._generate(source, target, width, fmt, quality)
+        return target
+
+    def build(self):
+        for root, dirs, files in os.walk(self.static_dir):
+            dirs[:] = [d for d in dirs if d != 'dist']
+            for name in files:
+                path = os.path.relpath(os.path.join(root, name), self.static_dir).replace(os.sep, '/')
+                if name.lower().endswith(SOURCES):
+                    for fmt in self.formats:
+                        for width in WIDTHS:
+                            self.variant(path, width, fmt[0])
+
+    def srcset(self, path, fmt):
+        source = self._source(path)
+        if source is None:
+            return ''
+        version = self._version(source)
+        return ', '.join(
+            '%s %dw' % (url_for('image_variant', width=width, fmt=fmt, filename=path, v=version), width)
+            for width in WIDTHS
+        )
+
+    def picture(self, path, sizes, alt='', css_class=None):
+        # <picture> with an AVIF and a WebP srcset, the original as fallback
+        img = Markup('<img src="%s" alt="%s"%s>') % (
+            self.asset_url(path), alt, Markup(' class="%s"') % css_class if css_class else '')
+        if not self.formats or self._source(path) is None:
+            return img
+        sources = Markup('').join(
+            Markup('<source type="%s" srcset="%s" sizes="%s">') % (mimetype, self.srcset(path, fmt), sizes)
+            for fmt, mimetype, _ in self.formats
+        )
+        return Markup('<picture>%s%s</picture>') % (sources, img)
+
+    def serve(self, width, fmt, filename):
+        target = self.variant(filename, width, fmt)
+        if target is None:
+            abort(404)
+        response = send_file(target, mimetype=dict((f[0], f[1]) for f in self.formats)[fmt], conditional=True)
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
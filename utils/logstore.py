@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+from collections import deque
+
+from utils.filelock import file_lock
+
+
+class LogStore:
+    # Activity logs are stored one JSON object per line so that a log write is a
+    # single append. The file is compacted back down to the newest `keep` entries
+    # once it has grown `compact_every` lines past that.
+    #
+    # Several worker processes can append to the same file: writes and
+    # compaction hold a file lock, and each process keeps its tail current by
+    # reading only the bytes added since it last looked (or everything again
+    # if another process compacted the file in between).
+
+    def __init__(self, path, keep=200, compact_every=1000):
+        self.path = path
+        self.keep = keep
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._tail = deque(maxlen=keep)
+        self._lines = 0
+        self._file = None
+        self._inode = None
+        self._pid = None
+        self._offset = 0
+        with self._lock, file_lock(self.path):
+            self._convert_legacy()
+            self._catch_up()
+
+    def _convert_legacy(self):
+        try:
+            with open(self.path, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+
+        if content.lstrip().startswith('['):
+            # old activity_logs.json format: a single JSON array
+            try:
+                entries = json.loads(content)
+            except ValueError:
+                entries = []
+            self._tail.extend(entries)
+            self._compact()
+
+    def _catch_up(self):
+        # the open handle pins the inode, so a compacted-and-replaced file can
+        # always be told apart from the one we were reading
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return
+        # a handle inherited across a fork shares its file position with the
+        # parent, so each process reads through its own
+        if self._file is None or inode != self._inode or self._pid != os.getpid():
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, 'rb')
+            self._pid = os.getpid()
+            if os.fstat(self._file.fileno()).st_ino != self._inode:
+                self._inode = os.fstat(self._file.fileno()).st_ino
+                self._tail.clear()
+                self._lines = 0
+                self._offset = 0
+
+        self._file.seek(self._offset)
+        data = self._file.read()
+        if not data:
+            return
+
+        # a line still being written by another process is left for next time
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            entry = _parse_line(line)
+            if entry is not None:
+                self._tail.append(entry)
+                self._lines += 1
+
+    def append(self, entry):
+        with self._lock, file_lock(self.path):
+            # ids keep counting up across compactions, entries from before
+            # ids existed count as 0
+            self._catch_up()
+            last_id = max((e.get('id', 0) for e in self._tail), default=0)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(dict(entry, id=last_id + 1)) + '\n')
+            self._catch_up()
+            if self._lines >= self.keep + self.compact_every:
+                self._compact()
+
+    def tail(self, limit=None):
+        with self._lock:
+            self._catch_up()
+            entries = list(self._tail)[-limit:] if limit else self._tail
+            return [dict(entry) for entry in entries]
+
+    def query(self, before=None, after=None, username=None, action=None, start=None, end=None, limit=100):
+        # same filters as SqliteLogStore.query, over the entries still kept
+        matches = []
+        for entry in self.tail():
+            entry_id = entry.setdefault('id', 0)
+            if before is not None and entry_id >= before:
+                continue
+            if after is not None and entry_id <= after:
+                continue
+            if username and entry.get('username') != username:
+                continue
+            if action and action not in (entry.get('action') or ''):
+                continue
+            if start and entry.get('timestamp', '') < start:
+                continue
+            if end and entry.get('timestamp', '') >= end:
+                continue
+            matches.append(entry)
+        return matches[:limit] if after is not None else matches[-limit:]
+
+    def compact(self):
+        with self._lock, file_lock(self.path):
+            self._catch_up()
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for entry in self._tail:
+                f.write(json.dumps(entry) + '\n')
+        # Windows can't replace a file this process still has open
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'rb')
+        self._pid = os.getpid()
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._offset = os.fstat(self._file.fileno()).st_size
+        self._lines = len(self._tail)
+
+
+def _parse_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        # a torn write from a crash mid-append, skip it
+        return None
@@ -0,0 +1,224 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+import psutil
+
+from utils.filelock import file_lock
+
+# upper bounds in seconds, the last bucket catches everything slower
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+FLUSH_EVERY = 10
+
+# counts of workers that have exited, so recycling a worker doesn't reset them
+RETIRED = 'metrics-retired.json'
+
+
+def _empty():
+    return {
+        'count': 0,
+        'errors': 0,
+        'sum': 0.0,
+        'bytes_in': 0,
+        'bytes_out': 0,
+        'buckets': [0] * (len(BUCKETS) + 1),
+    }
+
+
+def _merge(into, other):
+    for field in ('count', 'errors', 'sum', 'bytes_in', 'bytes_out'):
+        into[field] += other[field]
+    into['buckets'] = [a + b for a, b in zip(into['buckets'], other['buckets'])]
+
+
+def _merge_all(snapshots):
+    merged = {}
+    for snapshot in snapshots:
+        for entry in snapshot:
+            key = (entry['kind'], entry['name'])
+            if key not in merged:
+                merged[key] = _empty()
+            _merge(merged[key], entry)
+    return merged
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write(path, snapshot):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def percentile(series, fraction):
+    # estimated from the histogram, interpolating inside the bucket it lands in
+    count = series['count']
+    if not count:
+        return None
+    rank = fraction * count
+    seen = 0
+    for i, in_bucket in enumerate(series['buckets']):
+        if in_bucket and seen + in_bucket >= rank:
+            lower = BUCKETS[i - 1] if i > 0 else 0.0
+            upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1] * 2
+            return lower + (upper - lower) * (rank - seen) / in_bucket
+        seen += in_bucket
+    return BUCKETS[-1]
+
+
+class MetricsRegistry:
+    # Latency histograms, error counts and bytes per route and per upstream
+    # host. Each worker process counts in memory and every FLUSH_EVERY seconds
+    # writes a snapshot to `directory`; reading merges the snapshots of all
+    # live workers, so a page or a Prometheus scrape sees the whole server
+    # whichever worker answers it. The snapshot of a worker that has exited
+    # is added into RETIRED, the totals keep counting across restarts.
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._series = {}
+        self._flushed_at = 0.0
+
+    def configure(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        if self.directory is None:
+            # a recycled worker exits normally, its last few seconds still count
+            atexit.register(self.flush)
+        self.directory = directory
+
+    def observe(self, kind, name, seconds, error=False, bytes_in=0, bytes_out=0):
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                series = self._series[(kind, name)] = _empty()
+            series['count'] += 1
+            series['errors'] += int(error)
+            series['sum'] += seconds
+            series['bytes_in'] += bytes_in or 0
+            series['bytes_out'] += bytes_out or 0
+            series['buckets'][bisect.bisect_left(BUCKETS, seconds)] += 1
+            flush = self.directory and time.monotonic() - self._flushed_at > FLUSH_EVERY
+        if flush:
+            self.flush()
+
+    def _snapshot(self):
+        with self._lock:
+            self._flushed_at = time.monotonic()
+            return [
+                {'kind': kind, 'name': name, **series, 'buckets': list(series['buckets'])}
+                for (kind, name), series in self._series.items()
+            ]
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self):
+        if self.directory:
+            _write(self._path(os.getpid()), self._snapshot())
+
+    def _retire(self, path):
+        # under the lock only one worker adds a dead worker's snapshot, and
+        # only once: the snapshot is gone by the time the next one gets here
+        retired_path = os.path.join(self.directory, RETIRED)
+        with file_lock(retired_path):
+            snapshot = _read(path)
+            if snapshot is None:
+                return
+            retired = _merge_all([_read(retired_path) or [], snapshot])
+            _write(retired_path, [{'kind': kind, 'name': name, **series}
+                                  for (kind, name), series in retired.items()])
+            os.remove(path)
+
+    def collect(self):
+        # {(kind, name): series} over every worker, this one's counts are live
+        snapshots = [self._snapshot()]
+        if self.directory:
+            for filename in os.listdir(self.directory):
+                if not filename.startswith('metrics-') or not filename.endswith('.json') or filename == RETIRED:
+                    continue
+                pid = int(filename[len('metrics-'):-len('.json')])
+                if pid == os.getpid():
+                    continue
+                if not _alive(pid):
+                    self._retire(os.path.join(self.directory, filename))
+                    continue
+                snapshot = _read(os.path.join(self.directory, filename))
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+            retired = _read(os.path.join(self.directory, RETIRED))
+            if retired is not None:
+                snapshots.append(retired)
+        return _merge_all(snapshots)
+
+    def summary(self):
+        rows = []
+        for (kind, name), series in sorted(self.collect().items()):
+            count = series['count']
+            rows.append({
+                'kind': kind,
+                'name': name,
+                'count': count,
+                'errors': series['errors'],
+                'error_rate': round(series['errors'] / count, 4) if count else 0.0,
+                'avg_ms': round(series['sum'] / count * 1000, 1) if count else None,
+                'p50_ms': _ms(percentile(series, 0.5)),
+                'p95_ms': _ms(percentile(series, 0.95)),
+                'p99_ms': _ms(percentile(series, 0.99)),
+                'bytes_in': series['bytes_in'],
+                'bytes_out': series['bytes_out'],
+            })
+        return rows
+
+    def prometheus(self):
+        metric_names = {'route': 'ysws_http_request', 'upstream': 'ysws_upstream_request'}
+        lines = []
+        by_kind = {}
+        for (kind, name), series in sorted(self.collect().items()):
+            by_kind.setdefault(kind, []).append((name, series))
+
+        for kind, entries in by_kind.items():
+            base = metric_names.get(kind, f'ysws_{kind}')
+            label = 'route' if kind == 'route' else 'host'
+            lines.append(f'# TYPE {base}_duration_seconds histogram')
+            for name, series in entries:
+                labels = f'{label}="{_escape(name)}"'
+                cumulative = 0
+                for bound, in_bucket in zip(BUCKETS + ('+Inf',), series['buckets']):
+                    cumulative += in_bucket
+                    lines.append(f'{base}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{base}_duration_seconds_sum{{{labels}}} {series["sum"]}')
+                lines.append(f'{base}_duration_seconds_count{{{labels}}} {series["count"]}')
+            for suffix, field in (('errors_total', 'errors'), ('received_bytes_total', 'bytes_in'),
+                                  ('sent_bytes_total', 'bytes_out')):
+                lines.append(f'# TYPE {base}_{suffix} counter')
+                for name, series in entries:
+                    lines.append(f'{base}_{suffix}{{{label}="{_escape(name)}"}} {series[field]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _alive(pid):
+    # not os.kill(pid, 0), on Windows that terminates the process
+    return psutil.pid_exists(pid)
+
+
+registry = MetricsRegistry()
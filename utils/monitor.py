@@ -0,0 +1,128 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import psutil
+
+TEMP_FILE = "/sys/class/thermal/thermal_zone0/temp"
+
+
+def read_temp():
+    try:
+        with open(TEMP_FILE, "r") as f:
+            return int(f.read()) / 1000
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def read_load():
+    # psutil emulates the load average on Windows, where os.getloadavg()
+    # doesn't exist
+    try:
+        return list(psutil.getloadavg())
+    except (AttributeError, OSError):
+        return None
+
+
+def take_sample():
+    ram = psutil.virtual_memory()
+    return {
+        'time': time.time(),
+        'ram_used_mb': round(ram.used / (1024 ** 2)),
+        'ram_total_mb': round(ram.total / (1024 ** 2)),
+        'cpu_percent': psutil.cpu_percent(interval=None),
+        'temp_c': read_temp(),
+        'load': read_load(),
+    }
+
+
+class Monitor:
+    # One thread per process reads host stats from `sample` into a ring buffer
+    # and picks up new activity-log entries, then fans both out to every
+    # connected admin page. Each page only reads from its own queue, so N open
+    # tabs cost one read per interval instead of N polls. `sample` can be a
+    # cheap read of stats something else already collects; take_sample() is
+    # only the default.
+    #
+    # The thread starts on first use and stops once nobody has listened for
+    # `idle_after` seconds; it's never started before a fork.
+
+    def __init__(self, sample=take_sample, fetch_logs=None, interval=2.0, history=150, idle_after=30):
+        self.sample = sample
+        self.fetch_logs = fetch_logs
+        self.interval = interval
+        self.idle_after = idle_after
+        self.samples = deque(maxlen=history)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._wanted_until = 0.0
+        self._last_log_id = None
+
+    def _ensure_running(self):
+        with self._lock:
+            self._wanted_until = time.monotonic() + self.idle_after
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if not self.samples:
+                self.samples.append(self.sample())
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="monitor", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        self._last_log_id = None
+        while True:
+            if self.fetch_logs is not None:
+                try:
+                    self._publish_new_logs()
+                except Exception as e:
+                    print(f"Monitor: reading logs failed: {e}")
+
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._subscribers and time.monotonic() > self._wanted_until:
+                    self._thread = None
+                    return
+
+            sample = self.sample()
+            self.samples.append(sample)
+            self.publish('stats', sample)
+
+    def _publish_new_logs(self):
+        if self._last_log_id is None:
+            latest = self.fetch_logs(None)
+            self._last_log_id = latest[-1]['id'] if latest else 0
+            return
+        for entry in self.fetch_logs(self._last_log_id):
+            self._last_log_id = max(self._last_log_id, entry['id'])
+            self.publish('log', entry)
+
+    def publish(self, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait((event, data))
+            except queue.Full:
+                # a stalled client just misses events, it can't hold up the rest
+                pass
+
+    def latest(self):
+        self._ensure_running()
+        return self.samples[-1]
+
+    def subscribe(self, maxsize=100):
+        q = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.add(q)
+        self._ensure_running()
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+            self._wanted_until = time.monotonic() + self.idle_after
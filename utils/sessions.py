@@ -0,0 +1,204 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+serializer = TaggedJSONSerializer()
+
+
+class SessionStore:
+    # Session data by session id: an in-memory LRU in front of an optional
+    # SQLite table. With the table, every write goes through to it, so the
+    # other worker processes and a restarted server see the same sessions.
+    # Each write gets a new random version, and a read only compares that
+    # version against the table, so an unchanged session is never decoded
+    # twice while a session changed by another worker (a logout) is never
+    # served stale from memory.
+    #
+    # Sessions expire `ttl` seconds after they were last used.
+
+    def __init__(self, database=None, maxsize=1000, ttl=7 * 24 * 3600, touch_after=3600):
+        self.db = database
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.touch_after = touch_after
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._writes = 0
+        if self.db is not None:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " sid TEXT PRIMARY KEY,"
+                " version TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+
+    def _remember(self, sid, version, data, expires_at):
+        with self._lock:
+            self._memory[sid] = (version, data, expires_at)
+            self._memory.move_to_end(sid)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def _forget(self, sid):
+        with self._lock:
+            self._memory.pop(sid, None)
+
+    def get(self, sid):
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(sid)
+            if cached is not None:
+                self._memory.move_to_end(sid)
+
+        if self.db is None:
+            if cached is None or cached[2] < now:
+                self._forget(sid)
+                return None
+            version, data, expires_at = cached
+        else:
+            rows = self.db.query("SELECT version, expires_at FROM sessions WHERE sid = ?", (sid,))
+            if not rows or rows[0]['expires_at'] < now:
+                self._forget(sid)
+                return None
+            version, expires_at = rows[0]['version'], rows[0]['expires_at']
+            if cached is not None and cached[0] == version:
+                data = cached[1]
+            else:
+                rows = self.db.query("SELECT data FROM sessions WHERE sid = ?", (sid,))
+                if not rows:
+                    return None
+                data = serializer.loads(rows[0]['data'])
+            self._remember(sid, version, data, expires_at)
+
+        if expires_at - now < self.ttl - self.touch_after:
+            self.touch(sid)
+        return dict(data)
+
+    def set(self, sid, data):
+        version = secrets.token_hex(8)
+        expires_at = time.time() + self.ttl
+        data = dict(data)
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO sessions (sid, version, data, expires_at) VALUES (?, ?, ?, ?)",
+                (sid, version, serializer.dumps(data), expires_at),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self.db.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+        self._remember(sid, version, data, expires_at)
+
+    def touch(self, sid):
+        expires_at = time.time() + self.ttl
+        if self.db is not None:
+            self.db.execute("UPDATE sessions SET expires_at = ? WHERE sid = ?", (expires_at, sid))
+        with self._lock:
+            cached = self._memory.get(sid)
+            if cached is not None:
+                self._memory[sid] = (cached[0], cached[1], expires_at)
+
+    def delete(self, sid):
+        if self.db is not None:
+            self.db.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        self._forget(sid)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._memory)
+        stored = self.db.query("SELECT COUNT(*) AS n FROM sessions")[0]['n'] if self.db is not None else size
+        return {'size': size, 'maxsize': self.maxsize, 'stored': stored, 'ttl': self.ttl}
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.accessed = False
+        self.rotated_from = None
+
+    def regenerate(self):
+        # a fresh id for the same data, called on login so an id that was
+        # handed out (or planted) before authenticating stops working
+        if not self.new and self.rotated_from is None:
+            self.rotated_from = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+    # only responses that actually read the session get Vary: Cookie
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self.accessed = True
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+
+class ServerSessionInterface(SessionInterface):
+    # Flask sessions backed by a SessionStore. The cookie only carries an
+    # opaque random id, whatever a route puts in the session stays on the
+    # server.
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.get(sid)
+            if data is not None:
+                return ServerSession(data, sid=sid)
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if session.rotated_from is not None:
+            self.store.delete(session.rotated_from)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            self.store.set(session.sid, session)
+
+        if session.new or session.modified or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# how long a write waits for another connection's write lock. A sqlite3 call
+# blocks the whole process, gevent included, so under serve.py and the
+# gevent gunicorn workers this is kept short (the writes themselves take
+# milliseconds).
+BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 10))
+
+
+class Database:
+    # One SQLite file in WAL mode for the panel's own data. Readers don't block
+    # the writer and every worker process gets its own connection, a SQLite
+    # handle must not be carried across a fork.
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._pid = None
+        self._db = None
+
+    @property
+    def conn(self):
+        if self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, migrated_at TEXT NOT NULL)"
+            )
+            self._db.commit()
+            self._pid = os.getpid()
+        return self._db
+
+    def execute(self, sql, params=()):
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cursor
+
+    def query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front, so a read-modify-write
+        # can't interleave with another worker process doing the same
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def migrate_once(self, name, migrate):
+        # runs `migrate(conn)` and records it in the same transaction, so a
+        # crash halfway leaves nothing behind and the next start tries again
+        with self.transaction() as conn:
+            if not conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+                migrate(conn)
+                conn.execute("INSERT INTO migrations (name, migrated_at) VALUES (?, datetime('now'))", (name,))
+
+
+class SqliteRecordStore:
+    # Same interface as utils.credstore.RecordStore: records are JSON objects
+    # kept in insertion order, with the key field as the primary key.
+
+    def __init__(self, database, table, key_field, legacy_path=None):
+        self.db = database
+        self.table = table
+        self.key_field = key_field
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            f" {key_field} TEXT NOT NULL UNIQUE,"
+            " record TEXT NOT NULL)"
+        )
+        if legacy_path:
+            self.db.migrate_once(f"{table}:{legacy_path}", lambda conn: self._import_json(conn, legacy_path))
+
+    def _import_json(self, conn, path):
+        try:
+            with open(path, 'r') as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return
+        for record in records:
+            if self.key_field in record:
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {self.table} ({self.key_field}, record) VALUES (?, ?)",
+                    (record[self.key_field], json.dumps(record)),
+                )
+
+    def get(self, value):
+        rows = self.db.query(f"SELECT record FROM {self.table} WHERE {self.key_field} = ?", (value,))
+        return json.loads(rows[0]['record']) if rows else None
+
+    def all(self):
+        return [json.loads(row['record']) for row in self.db.query(f"SELECT record FROM {self.table} ORDER BY id")]
+
+    def replace(self, records):
+        with self.db.transaction() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} ({self.key_field}, record) VALUES (?, ?)",
+                [(r[self.key_field], json.dumps(r)) for r in records if self.key_field in r],
+            )
+
+    def add(self, record):
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {self.table} ({self.key_field}, record) VALUES (?, ?)",
+            (record[self.key_field], json.dumps(record)),
+        )
+
+    def remove(self, value):
+        return self.db.execute(f"DELETE FROM {self.table} WHERE {self.key_field} = ?", (value,)).rowcount > 0
+
+    def update(self, value, **changes):
+        with self.db.transaction() as conn:
+            row = conn.execute(f"SELECT record FROM {self.table} WHERE {self.key_field} = ?", (value,)).fetchone()
+            if row is None:
+                return False
+            record = dict(json.loads(row['record']), **changes)
+            conn.execute(f"UPDATE {self.table} SET record = ? WHERE {self.key_field} = ?", (json.dumps(record), value))
+            return True
+
+
+class SqliteLogStore:
+    # Same interface as utils.logstore.LogStore, without the size cap: every
+    # entry is kept and an append is a single indexed insert.
+
+    def __init__(self, database, legacy_path=None):
+        self.db = database
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS activity_logs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " timestamp TEXT NOT NULL,"
+            " username TEXT,"
+            " action TEXT,"
+            " details TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS activity_logs_timestamp ON activity_logs (timestamp)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS activity_logs_username ON activity_logs (username, id)")
+        if legacy_path:
+            self.db.migrate_once(f"activity_logs:{legacy_path}", lambda conn: self._import_json(conn, legacy_path))
+
+    def _import_json(self, conn, path):
+        try:
+            with open(path, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+
+        if content.lstrip().startswith('['):
+            entries = json.loads(content)
+        else:
+            entries = []
+            for line in content.splitlines():
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        conn.executemany(
+            "INSERT INTO activity_logs (timestamp, username, action, details) VALUES (?, ?, ?, ?)",
+            [(e.get('timestamp', ''), e.get('username'), e.get('action'), e.get('details')) for e in entries],
+        )
+
+    def append(self, entry):
+        self.db.execute(
+            "INSERT INTO activity_logs (timestamp, username, action, details) VALUES (?, ?, ?, ?)",
+            (entry['timestamp'], entry.get('username'), entry.get('action'), entry.get('details')),
+        )
+
+    def tail(self, limit=200):
+        return self.query(limit=limit)
+
+    def query(self, before=None, after=None, username=None, action=None, start=None, end=None, limit=100):
+        # `before` pages back through history, `after` fetches what's new
+        # since the last id a client has seen. Both walk the primary key, so
+        # a page costs the same at 100 or 100k entries. Oldest first.
+        where, params = [], []
+        if before is not None:
+            where.append("id < ?")
+            params.append(before)
+        if after is not None:
+            where.append("id > ?")
+            params.append(after)
+        if username:
+            where.append("username = ?")
+            params.append(username)
+        if action:
+            where.append("action LIKE ? ESCAPE '\\'")
+            params.append('%' + action.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if start:
+            where.append("timestamp >= ?")
+            params.append(start)
+        if end:
+            where.append("timestamp < ?")
+            params.append(end)
+
+        order = "ASC" if after is not None else "DESC"
+        rows = self.db.query(
+            "SELECT id, timestamp, username, action, details FROM activity_logs"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + f" ORDER BY id {order} LIMIT ?",
+            params + [limit],
+        )
+        entries = [dict(row) for row in rows]
+        return entries if order == "ASC" else entries[::-1]
@@ -0,0 +1,174 @@
+import math
+import mmap
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# (seconds per point, number of points): 10 minutes at 1s, a day at 1 minute,
+# 30 days at 15 minutes
+RESOLUTIONS = ((1, 600), (60, 1440), (900, 2880))
+
+
+class TimeSeriesStore:
+    # Fixed-size ring buffers of samples at several resolutions, packed as
+    # doubles in one memory-mapped file. A point's slot is its bucket number
+    # modulo the buffer length, so there is no head pointer to keep in sync and
+    # an old slot is recognised by its stale bucket timestamp. Every slot
+    # holds the bucket start, the sample count, then the sum and the max of
+    # each field, so coarse points keep both the average and the peak.
+    #
+    # Every worker process maps the same file: one writes, all can read, and
+    # the history survives restarts.
+
+    def __init__(self, path, fields, resolutions=RESOLUTIONS):
+        self.path = path
+        self.fields = tuple(fields)
+        self.resolutions = tuple(resolutions)
+        self.slot_size = 2 + 2 * len(self.fields)
+        self._offsets = []
+        total = 0
+        for _, points in self.resolutions:
+            self._offsets.append(total)
+            total += points * self.slot_size
+
+        size = total * 8
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                # new file, or the layout changed: start over
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._data = memoryview(self._mmap).cast('d')
+
+    def _slot(self, level, bucket):
+        step, points = self.resolutions[level]
+        return self._offsets[level] + (bucket % points) * self.slot_size
+
+    def record(self, values, now=None):
+        now = time.time() if now is None else now
+        data = self._data
+        for level, (step, _) in enumerate(self.resolutions):
+            bucket = int(now // step)
+            start = bucket * step
+            slot = self._slot(level, bucket)
+            if data[slot] != start:
+                data[slot] = start
+                data[slot + 1] = 0
+                for i in range(len(self.fields)):
+                    data[slot + 2 + 2 * i] = 0.0
+                    data[slot + 3 + 2 * i] = -math.inf
+            data[slot + 1] += 1
+            for i, field in enumerate(self.fields):
+                value = values.get(field)
+                if value is None:
+                    continue
+                data[slot + 2 + 2 * i] += value
+                data[slot + 3 + 2 * i] = max(data[slot + 3 + 2 * i], value)
+
+    def latest(self, max_age=5, now=None):
+        # the newest finished point at the finest resolution, None once the
+        # recorder has stopped writing. The bucket that is still being filled
+        # is skipped, its sums and count may be halfway through an update.
+        now = time.time() if now is None else now
+        step = self.resolutions[0][0]
+        data = self._data
+        for bucket in range(int(now // step) - 1, int((now - max_age) // step) - 1, -1):
+            slot = self._slot(0, bucket)
+            count = data[slot + 1]
+            if data[slot] != bucket * step or count <= 0:
+                continue
+            point = {'time': bucket * step}
+            for i, field in enumerate(self.fields):
+                if data[slot + 3 + 2 * i] == -math.inf:
+                    point[field] = None
+                else:
+                    point[field] = data[slot + 2 + 2 * i] / count
+            return point
+        return None
+
+    def pick_step(self, seconds):
+        # the finest resolution that still covers the requested range
+        for step, points in self.resolutions:
+            if step * points >= seconds:
+                return step
+        return self.resolutions[-1][0]
+
+    def query(self, start, end, step=None):
+        step = step or self.pick_step(end - start)
+        level = next(i for i, (s, _) in enumerate(self.resolutions) if s == step)
+        points = self.resolutions[level][1]
+        first = max(int(start // step), int(end // step) - points + 1)
+        last = int(end // step)
+
+        data = self._data
+        series = {'time': []}
+        for field in self.fields:
+            series[field] = []
+            series[field + '_max'] = []
+        for bucket in range(first, last + 1):
+            slot = self._slot(level, bucket)
+            series['time'].append(bucket * step)
+            count = data[slot + 1]
+            fresh = data[slot] == bucket * step and count > 0
+            for i, field in enumerate(self.fields):
+                peak = data[slot + 3 + 2 * i] if fresh else -math.inf
+                # a field that had no value in the bucket (no temp sensor) stays -inf
+                if peak == -math.inf:
+                    series[field].append(None)
+                    series[field + '_max'].append(None)
+                else:
+                    series[field].append(round(data[slot + 2 + 2 * i] / count, 3))
+                    series[field + '_max'].append(round(peak, 3))
+        return {'step': step, 'series': series}
+
+
+class HistoryRecorder:
+    # Feeds `sample()` into a TimeSeriesStore once a second. Only the process
+    # that holds the lock file records; the other workers retry now and then,
+    # so recording moves to another worker if the current one exits. Without
+    # flock (Windows) there's no election and the process just records.
+
+    def __init__(self, store, sample, interval=1.0, retry_every=30):
+        self.store = store
+        self.sample = sample
+        self.interval = interval
+        self.retry_every = retry_every
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="history", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        fd = os.open(self.store.path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        while fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                time.sleep(self.retry_every)
+
+        while True:
+            started = time.time()
+            try:
+                values = self.sample()
+                self.store.record(values, now=started)
+            except Exception as e:
+                print(f"History: sampling failed: {e}")
+            time.sleep(max(0.0, self.interval - (time.time() - started)))